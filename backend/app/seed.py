@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Dict, List
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, insert, select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session, sessionmaker
 
@@ -13,6 +13,49 @@ class SeedError(Exception):
     """Erro de alto nível para problemas durante o seed de dados."""
 
 
+# Estrutura fixa de categorias, no nível do módulo para que consumidores
+# (por exemplo, seeds em lote nos testes) reutilizem a mesma definição.
+_ROOTS_WITH_CHILDREN: Dict[str, List[str]] = {
+    "Ajuda família": ["Ajuda Bruna Isabela", "Família Dadi"],
+    "Despesas pessoais": [
+        "Ana - Cuidados pessoais",
+        "Carol - Cuidados pessoais",
+        "Casa - Cuidados pessoais",
+        "Eduardo - Cuidados pessoais",
+    ],
+    "Educação": ["Carol", "Ana", "Eduardo"],
+    "Moradia": [
+        "água",
+        "Internet + Tv + celulares",
+        "Iptu",
+        "Luz",
+        "manutenções",
+        "Mobília",
+    ],
+    "Saúde": ["medicamentos", "profissionais saúde", "Suplementos"],
+    "Transporte": ["Gasolina", "manutenção carro", "seguro", "Tags pedágio"],
+    "Trabalho": ["Almoço", "bike e etc", "passagens"],
+    "Viagem": [
+        "Natal",
+        "Portugal 202508",
+        "Portugal 202606",
+        "Portugal-202502",
+        "São Pedro 202410",
+    ],
+}
+
+_OUTROS_CHILDREN: List[str] = [
+    "Assinaturas e serviços",
+    "Bares e restaurantes",
+    "Despesas reembolsadas",
+    "Impostos e Taxas",
+    "Cinema e aluguel",
+    "Mercado",
+    "Diversos",
+    "Presentes e doações (dízimos, ofertas, Presentes)",
+]
+
+
 def get_engine(database_url: str) -> "create_engine":
     """Cria uma engine SQLAlchemy.
 
@@ -26,6 +69,24 @@ def get_engine(database_url: str) -> "create_engine":
     return create_engine(database_url, echo=False, future=True)
 
 
+def get_session_factory_for_engine(engine) -> sessionmaker[Session]:
+    """Cria uma fábrica de sessões para uma engine já existente.
+
+    Útil quando o chamador controla o ciclo de vida da engine (por exemplo,
+    bancos em memória com StaticPool nos testes) e não quer que uma nova
+    engine seja criada a partir da URL.
+
+    Args:
+        engine: Engine SQLAlchemy já configurada.
+
+    Returns:
+        Um sessionmaker tipado para `Session`.
+    """
+
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+
+
 def get_session_factory(database_url: str) -> sessionmaker[Session]:
     """Cria uma fábrica de sessões vinculada à engine.
 
@@ -36,9 +97,7 @@ def get_session_factory(database_url: str) -> sessionmaker[Session]:
         Um sessionmaker tipado para `Session`.
     """
 
-    engine = get_engine(database_url)
-    Base.metadata.create_all(engine)
-    return sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+    return get_session_factory_for_engine(get_engine(database_url))
 
 
 def _create_category_hierarchy(session: Session) -> None:
@@ -51,58 +110,33 @@ def _create_category_hierarchy(session: Session) -> None:
         session: Sessão ativa do SQLAlchemy.
     """
 
-    roots_with_children: Dict[str, List[str]] = {
-        "Ajuda família": ["Ajuda Bruna Isabela", "Família Dadi"],
-        "Despesas pessoais": [
-            "Ana - Cuidados pessoais",
-            "Carol - Cuidados pessoais",
-            "Casa - Cuidados pessoais",
-            "Eduardo - Cuidados pessoais",
-        ],
-        "Educação": ["Carol", "Ana", "Eduardo"],
-        "Moradia": [
-            "água",
-            "Internet + Tv + celulares",
-            "Iptu",
-            "Luz",
-            "manutenções",
-            "Mobília",
-        ],
-        "Saúde": ["medicamentos", "profissionais saúde", "Suplementos"],
-        "Transporte": ["Gasolina", "manutenção carro", "seguro", "Tags pedágio"],
-        "Trabalho": ["Almoço", "bike e etc", "passagens"],
-        "Viagem": [
-            "Natal",
-            "Portugal 202508",
-            "Portugal 202606",
-            "Portugal-202502",
-            "São Pedro 202410",
-        ],
+    # Dois INSERTs em lote (raízes e filhas) em vez de add + flush por
+    # categoria: os ids das raízes são resolvidos com um único SELECT entre
+    # os dois níveis.
+    children_by_root: Dict[str, List[str]] = {
+        "Outros": _OUTROS_CHILDREN,
+        **_ROOTS_WITH_CHILDREN,
     }
 
-    outros_root = Category(name="Outros", parent=None)
-    session.add(outros_root)
-    session.flush()
-
-    outros_children: List[str] = [
-        "Assinaturas e serviços",
-        "Bares e restaurantes",
-        "Despesas reembolsadas",
-        "Impostos e Taxas",
-        "Cinema e aluguel",
-        "Mercado",
-        "Diversos",
-        "Presentes e doações (dízimos, ofertas, Presentes)",
-    ]
-    for child_name in outros_children:
-        session.add(Category(name=child_name, parent=outros_root))
-
-    for root_name, children in roots_with_children.items():
-        root_category = Category(name=root_name, parent=None)
-        session.add(root_category)
-        session.flush()
-        for child_name in children:
-            session.add(Category(name=child_name, parent=root_category))
+    session.execute(
+        insert(Category),
+        [{"name": root_name, "parent_id": None} for root_name in children_by_root],
+    )
+
+    root_ids = dict(
+        session.execute(
+            select(Category.name, Category.id).where(Category.parent_id.is_(None))
+        ).all()
+    )
+
+    session.execute(
+        insert(Category),
+        [
+            {"name": child_name, "parent_id": root_ids[root_name]}
+            for root_name, children in children_by_root.items()
+            for child_name in children
+        ],
+    )
 
 
 def seed_categories(database_url: str) -> None:
@@ -125,5 +159,11 @@ def seed_categories(database_url: str) -> None:
         raise SeedError("Falha ao executar seed de categorias.") from exc
 
 
-__all__ = ["seed_categories", "SeedError", "get_session_factory", "get_engine"]
+__all__ = [
+    "seed_categories",
+    "SeedError",
+    "get_session_factory",
+    "get_session_factory_for_engine",
+    "get_engine",
+]
 
@@ -2,8 +2,37 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-
-@dataclass(frozen=True)
+from . import browser_pool
+
+# Tipos de subrecurso abortados quando disable_resources está ativo: só o
+# HTML interessa ao fetch, então imagens, fontes e afins são bytes perdidos.
+_BLOCKED_RESOURCE_TYPES = frozenset(
+    {
+        "image",
+        "imageset",
+        "font",
+        "media",
+        "stylesheet",
+        "beacon",
+        "websocket",
+        "csp_report",
+        "texttrack",
+    }
+)
+
+
+def _abort_blocked_resources(route) -> None:
+    """Handler de rota: aborta subrecursos supérfluos, deixa o resto seguir."""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
+
+# frozen + slots: imediatamente hashável/compartilhável entre threads e sem
+# __dict__ por instância — o fetch nunca muta as options depois de construídas
+# (a retentativa passa headless como argumento, não via mutação).
+@dataclass(frozen=True, slots=True)
 class BrowserFetchOptions:
     headless: bool = True
     timeout_ms: int = 20_000
@@ -13,14 +42,25 @@ class BrowserFetchOptions:
         "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
     )
     slow_mo_ms: int = 300
+    # Teto da espera pós-carregamento por rede ociosa (não é mais um sleep fixo).
     post_load_wait_ms: int = 1500
+    # Seletor que indica que a página está pronta; quando definido, substitui
+    # a espera por rede ociosa.
+    readiness_selector: str | None = None
+    # Aborta imagens/fontes/mídia/CSS — só o HTML retornado importa.
+    disable_resources: bool = True
 
 
 class BrowserHTMLFetcher:
     """Busca HTML usando um browser real (Playwright).
 
-    Importante: o import do Playwright é lazy para não quebrar ambientes
-    onde a dependência não está instalada/ativada.
+    O browser vem do pool do processo (`browser_pool`), que amortiza o
+    cold-start do Chromium entre fetches; cada fetch cria apenas um
+    BrowserContext novo, que é barato e isola cookies/cache.
+
+    Invariante: nem este módulo nem `BrowserFetchOptions` tocam o Playwright
+    em tempo de import — o custo de `import playwright` só é pago no primeiro
+    `fetch()`. Construir o fetcher (ou coletar estes testes) é grátis.
     """
 
     def __init__(self, options: BrowserFetchOptions | None = None) -> None:
@@ -29,50 +69,74 @@ class BrowserHTMLFetcher:
     def fetch(self, url: str) -> str:
         """Navega até a URL e retorna o HTML renderizado."""
 
-        try:
-            # Lazy import: só exige Playwright quando esse fetcher é usado.
-            from playwright.sync_api import sync_playwright  # type: ignore[import-not-found]
-        except Exception as exc:  # pragma: no cover
-            raise RuntimeError(
-                "Playwright não está disponível. Instale `playwright` e rode "
-                "`playwright install chromium`."
-            ) from exc
-
         def _looks_like_rj_block_page(html: str) -> bool:
             text = html.lower()
             return "secretaria de estado de fazenda do rio de janeiro".lower() in text
 
-        def _fetch_once(playwright, headless: bool) -> str:
-            launch_kwargs: dict = {
-                "headless": headless,
-                "slow_mo": self._options.slow_mo_ms,
-            }
-            browser = playwright.chromium.launch(**launch_kwargs)
+        def _fetch_once(headless: bool) -> str:
+            browser = browser_pool.get_browser(headless, self._options.slow_mo_ms)
+            # Se o pool entregou um browser, o Playwright está disponível.
+            from playwright.sync_api import (  # type: ignore[import-not-found]
+                TimeoutError as PlaywrightTimeoutError,
+            )
+
             context = browser.new_context(
                 user_agent=self._options.user_agent,
                 locale="pt-BR",
             )
-            page = context.new_page()
-            page.goto(
-                url,
-                wait_until=self._options.wait_until,
-                timeout=self._options.timeout_ms,
-            )
-            # Aguarda um pouco após o carregamento para JS/redirects finais.
-            page.wait_for_timeout(self._options.post_load_wait_ms)
-            html = page.content()
-            context.close()
-            browser.close()
-            return html
-
-        with sync_playwright() as p:
-            # 1ª tentativa: modo headless (silencioso)
-            html = _fetch_once(p, headless=self._options.headless)
-
-            # Se ainda parecer a página genérica da SEFAZ-RJ, tenta uma segunda
-            # vez com headless=False (mostrar o navegador)
-            if _looks_like_rj_block_page(html) and self._options.headless:
-                html = _fetch_once(p, headless=False)
+            try:
+                if self._options.disable_resources:
+                    context.route("**/*", _abort_blocked_resources)
+                page = context.new_page()
+                response = page.goto(
+                    url,
+                    wait_until=self._options.wait_until,
+                    timeout=self._options.timeout_ms,
+                )
+                # Detecção precoce do bloqueio da SEFAZ-RJ: olha só os
+                # primeiros 4KB do corpo da resposta de navegação e, em modo
+                # headless, aborta antes de pagar as esperas e o content() —
+                # a retentativa headful começa imediatamente.
+                if headless and response is not None:
+                    prefix = (response.text() or "")[:4096]
+                    if _looks_like_rj_block_page(prefix):
+                        return ""
+                # Espera dirigida por eventos em vez do sleep fixo: ou o
+                # seletor de prontidão do chamador, ou DOM pronto + rede
+                # ociosa com `post_load_wait_ms` servindo apenas de teto.
+                if self._options.readiness_selector:
+                    page.wait_for_selector(
+                        self._options.readiness_selector,
+                        timeout=self._options.timeout_ms,
+                    )
+                else:
+                    page.wait_for_load_state("domcontentloaded")
+                    try:
+                        page.wait_for_load_state(
+                            "networkidle",
+                            timeout=min(self._options.post_load_wait_ms, 3000),
+                        )
+                    except PlaywrightTimeoutError:
+                        # Página sem rede ociosa dentro do teto: segue com o
+                        # conteúdo já renderizado.
+                        pass
+                return page.content()
+            finally:
+                # Só o context é fechado — o browser pertence ao pool.
+                context.close()
+
+        # 1ª tentativa: modo headless (silencioso). O fetch inteiro roda na
+        # thread dona do pool via run() — a API síncrona do Playwright só
+        # pode ser usada na thread que a iniciou, e os endpoints sync do
+        # FastAPI chegam aqui por threads variadas do threadpool.
+        html = browser_pool.run(_fetch_once, self._options.headless)
+
+        # Se o bloqueio foi detectado cedo ("" sinaliza) ou o HTML final ainda
+        # parecer a página genérica da SEFAZ-RJ, tenta uma segunda vez com
+        # headless=False (mostrar o navegador); o browser headful também vem
+        # do pool, então só o primeiro bloqueio paga esse launch.
+        if (not html or _looks_like_rj_block_page(html)) and self._options.headless:
+            html = browser_pool.run(_fetch_once, False)
 
         return html
 
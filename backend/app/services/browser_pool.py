@@ -0,0 +1,149 @@
+"""Pool de browsers Playwright compartilhado pelo processo.
+
+O custo dominante de um fetch com browser real é o cold-start do Chromium
+(centenas de ms por lançamento). Este módulo mantém um único handle do
+Playwright e um browser por modo (headless/headful), reaproveitados entre
+fetches; os contexts continuam sendo criados por chamada — são ordens de
+grandeza mais baratos e isolam cookies/cache entre fetches.
+
+Afinidade de thread: a API síncrona do Playwright amarra seus objetos à
+thread que executou `sync_playwright().start()` (greenlet por thread) —
+usá-los de outra thread levanta `greenlet.error`. A garantia de concorrência
+deste módulo vem daí: todo trabalho que toca o Playwright é despachado para
+uma única thread dona via `run()`, então chamadores em qualquer thread (por
+exemplo, o threadpool de endpoints sync do FastAPI) nunca tocam os objetos
+diretamente e os fetches ficam serializados nessa thread. `get_browser` deve
+ser chamado de dentro de um `run()`. O isolamento de estado entre fetches
+segue vindo do BrowserContext efêmero (modo incógnito) criado por chamada —
+não existe user-data-dir compartilhado em disco.
+
+Importante: o import do Playwright é lazy para não quebrar ambientes onde a
+dependência não está instalada/ativada.
+"""
+
+from __future__ import annotations
+
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+_owner_thread: Optional[threading.Thread] = None
+_playwright = None
+# Browser compartilhado por modo; chave é o flag headless.
+_browsers: Dict[bool, object] = {}
+
+
+def _ensure_executor() -> ThreadPoolExecutor:
+    """Cria (uma única vez) a thread dona de todos os objetos Playwright."""
+
+    global _executor, _owner_thread
+
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="browser-pool"
+            )
+            _owner_thread = _executor.submit(threading.current_thread).result()
+        return _executor
+
+
+def run(func, /, *args, **kwargs):
+    """Executa `func` na thread dona do Playwright e retorna o resultado.
+
+    Exceções levantadas por `func` são propagadas ao chamador. Chamadas já
+    na thread dona executam direto, permitindo composição (um `func` pode
+    chamar `get_browser` ou outro `run`).
+    """
+
+    if threading.current_thread() is _owner_thread:
+        return func(*args, **kwargs)
+    return _ensure_executor().submit(func, *args, **kwargs).result()
+
+
+def get_browser(headless: bool, slow_mo_ms: int = 0):
+    """Retorna o browser compartilhado para o modo pedido, lançando se preciso.
+
+    Deve ser chamado na thread dona do pool (isto é, de dentro de `run()`):
+    o browser retornado só pode ser usado nessa thread.
+
+    O `slow_mo_ms` só é aplicado no primeiro lançamento de cada modo — é uma
+    opção de launch e não pode ser alterada num browser já aberto.
+
+    Args:
+        headless: Se o browser deve rodar sem interface.
+        slow_mo_ms: Atraso artificial entre ações do Playwright.
+
+    Returns:
+        Instância de Browser conectada.
+
+    Raises:
+        RuntimeError: Se o Playwright não estiver disponível no ambiente.
+    """
+
+    global _playwright
+
+    browser = _browsers.get(headless)
+    if browser is not None and browser.is_connected():
+        return browser
+
+    if _playwright is None:
+        try:
+            # Lazy import: só exige Playwright quando um fetch acontece.
+            from playwright.sync_api import sync_playwright  # type: ignore[import-not-found]
+        except Exception as exc:  # pragma: no cover
+            raise RuntimeError(
+                "Playwright não está disponível. Instale `playwright` e rode "
+                "`playwright install chromium`."
+            ) from exc
+        _playwright = sync_playwright().start()
+
+    browser = _playwright.chromium.launch(headless=headless, slow_mo=slow_mo_ms)
+    _browsers[headless] = browser
+    return browser
+
+
+def _close_all_on_owner_thread() -> None:
+    """Fecha browsers e handle do Playwright; roda na thread dona."""
+
+    global _playwright
+
+    for browser in _browsers.values():
+        try:
+            browser.close()
+        except Exception:
+            pass
+    _browsers.clear()
+
+    if _playwright is not None:
+        try:
+            _playwright.stop()
+        except Exception:
+            pass
+        _playwright = None
+
+
+def close_all() -> None:
+    """Fecha os browsers e o handle do Playwright (idempotente).
+
+    Pode ser chamado de qualquer thread: o fechamento é despachado para a
+    thread dona, já que `close()`/`stop()` também são chamadas Playwright.
+    """
+
+    if _executor is None:
+        # Pool nunca foi usado — nada para fechar.
+        return
+    try:
+        run(_close_all_on_owner_thread)
+    except RuntimeError:
+        # Executor já encerrado pelo shutdown do interpretador (o hook do
+        # concurrent.futures roda antes dos handlers de atexit); os processos
+        # do Chromium morrem junto com o processo pai.
+        pass
+
+
+atexit.register(close_all)
+
+__all__ = ["get_browser", "close_all", "run"]
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 from datetime import date
+from functools import lru_cache
 import json
 import os
 import re
-from typing import Dict, List, Type
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
 from uuid import uuid4
 
 import requests
+from requests.adapters import HTTPAdapter, Retry
 from bs4 import BeautifulSoup
 
 from .xml_handler import ParsedItem, ParsedNote
@@ -17,10 +20,250 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Backend de parsing do BeautifulSoup: lxml (em C) é bem mais rápido que o
+# html.parser puro-Python; mantém o fallback caso lxml não esteja instalado.
+try:
+    import lxml  # noqa: F401
+
+    _BS_PARSER = "lxml"
+except ImportError:  # pragma: no cover
+    _BS_PARSER = "html.parser"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_NON_DIGIT_SPACE_RE = re.compile(r"[^\d\s]")
+
+# Padrões de data de emissão, como em "Emissão: 11/02/2026 07:35:22-03:00".
+# Uma única alternação cobre "Emissão:" e "Data Emissão:", com ou sem hora;
+# o padrão de data/hora sem rótulo e a data isolada ficam como fallbacks.
+_EMISSION_DATE_RE = re.compile(
+    r"(?:Data\s+)?Emiss[aã]o\s*:\s*(\d{2}/\d{2}/\d{4})", re.IGNORECASE
+)
+_DATETIME_RE = re.compile(
+    r"(\d{2}/\d{2}/\d{4})\s+\d{2}:\d{2}:\d{2}(?:[-+]\d{2}:?\d{2})?"
+)
+_SIMPLE_DATE_RE = re.compile(r"\b(\d{2}/\d{2}/\d{4})\b")
+
+# Trechos de texto que não podem ser nome de produto (códigos, quantidades,
+# preços); um único search pré-compilado substitui cadeias de any()/in.
+_NAME_REJECT_RE = re.compile(
+    r"código|qtde|un:|vl\.\s*unit|r\$|valor|cnpj|documento auxiliar",
+    re.IGNORECASE,
+)
+
+# Padrões dos campos de item ("Qtde.: 1", "UN: UN", "Vl. Unit.: 7,99")
+_QTDE_RE = re.compile(r"Qtde\.?:?\s*([0-9,.]+)", re.IGNORECASE)
+_UN_RE = re.compile(r"UN:\s*(\w+)", re.IGNORECASE)
+_VL_UNIT_RE = re.compile(r"Vl\.?\s*Unit\.?:?\s*([0-9,.]+)", re.IGNORECASE)
+
+# Total da nota, como em "Valor a pagar R$: 102,80"
+_TOTAL_AMOUNT_RE = re.compile(
+    r"Valor\s+a\s+pagar\s*R\$[: ]\s*([\d\.,]+)", re.IGNORECASE
+)
+
+# Total genérico: palavra "Total" seguida (a até 40 chars) de um valor no
+# formato brasileiro, como em "Total da compra: R$ 150,75".
+_TOTAL_KEYWORD_RE = re.compile(
+    r"Total[^0-9]{0,40}(\d{1,3}(?:\.\d{3})*,\d{2})", re.IGNORECASE
+)
+
+# Bloco de item do layout moderno do RJ (sem tabela), como em:
+#
+#     TAXA ENTREGA CAMBOIN (Código: 6378 )
+#     Qtde:1   UN: UN   Vl. Unit.: 7,99   Vl. Total 7,99
+#
+# Um único finditer captura o bloco inteiro em uma passada; os intervalos
+# entre os campos usam limites fixos ({0,40}) em vez de ".*?" aberto para
+# não reintroduzir backtracking exponencial.
+_ITEM_BLOCK_RE = re.compile(
+    r"(?P<name>[^\n]+?)\s*"
+    r"Qtde\.?:\s*(?P<qty>[\d.,]+)[\s\S]{0,40}?"
+    r"UN:\s*(?P<unit>\w+)[\s\S]{0,40}?"
+    r"Vl\.?\s*Unit\.?:?\s*(?P<unit_price>[\d.,]+)[\s\S]{0,40}?"
+    r"Vl\.?\s*Total:?\s*(?P<total>[\d.,]+)",
+    re.IGNORECASE,
+)
+
+# Padrões de chave de acesso (44 dígitos, possivelmente com espaços).
+# Ex.: 3326 0210 6976 9700 0660 6510 7000 3680 6612 6649 4182
+#      33260210697697000660651070003680661266494182
+_ACCESS_KEY_PATTERNS = [
+    # "Chave de Acesso" seguida de dígitos/espaços
+    re.compile(r"Chave\s*de\s*Acesso[^\d]*([0-9\s]{40,50})", re.IGNORECASE),
+    # Apenas o padrão de 44 dígitos (com possíveis espaços)
+    re.compile(r"([0-9\s]{40,50})"),
+]
+
+
+# Pré-checagem de valores numéricos em formato brasileiro ("1.234,56")
+_NUM_CLEAN_RE = re.compile(r"^[\d.,]+$")
+
+# Tabela de tradução que descarta o separador de milhar e troca a vírgula
+# decimal por ponto em uma única passada, sem as duas alocações de replace.
+_BR_NUM_TRANS = str.maketrans({",": ".", ".": None})
+
+
+def _to_float(value: str, default: float = 0.0) -> float:
+    """Converte um número em formato brasileiro ("1.234,56") para float.
+
+    Valores malformados retornam `default` após uma pré-checagem barata de
+    regex, em vez de usar exceção como controle de fluxo no caminho quente.
+    """
+    if not _NUM_CLEAN_RE.match(value):
+        return default
+    try:
+        return float(value.translate(_BR_NUM_TRANS))
+    except ValueError:
+        # Caso raro: múltiplos separadores ("1,2,3") passam na pré-checagem.
+        return default
+
+
+def _format_access_key(clean_key: str) -> str:
+    """Formata a chave de 44 dígitos com espaços a cada 4 dígitos."""
+    return " ".join(clean_key[i : i + 4] for i in range(0, len(clean_key), 4))
+
+
+def _extract_seller_name_common(soup: BeautifulSoup) -> Optional[str]:
+    """Parte comum da extração do nome do vendedor entre os adapters.
+
+    Procura pelo elemento txtTopo com id u20 (layout padrão das páginas de
+    NFC-e) e, quando presente, anexa o CNPJ da div seguinte. Retorna None se
+    o layout específico não for encontrado, deixando o fallback por conta de
+    cada adapter.
+    """
+    seller_div = soup.find("div", {"class": "txtTopo", "id": "u20"})
+    if seller_div is None:
+        return None
+
+    seller_name = seller_div.get_text(strip=True)
+    # Formatação lazy (%s) e nível debug: em produção a chamada retorna após
+    # o teste de nível, sem formatar nada no caminho quente do parse.
+    logger.debug("[fiscal-items] seller_name lido: %s", seller_name)
+
+    # Procura pelo CNPJ que está na div seguinte
+    cnpj_div = seller_div.find_next_sibling("div", class_="text")
+    if cnpj_div:
+        cnpj_text = cnpj_div.get_text(strip=True)
+        if "CNPJ:" in cnpj_text.upper():
+            return f"{seller_name}; {cnpj_text}"
+
+    return seller_name
+
+
+def _extract_access_key_common(
+    soup: BeautifulSoup, text: Optional[str] = None, *, fallback_prefix: str
+) -> str:
+    """Extração da chave de acesso, compartilhada entre os adapters.
+
+    Tenta primeiro elementos específicos do HTML (spans com classe "chave",
+    tags strong próximas de "Chave de acesso"); se não encontrar, cai para a
+    varredura textual com os padrões pré-compilados. Como último recurso,
+    gera uma chave sintética com o prefixo do adapter.
+    """
+    # Look for span elements with class 'chave' which often contain the access key
+    chave_spans = soup.find_all("span", class_="chave")
+    if chave_spans:
+        raw_key = chave_spans[0].get_text(strip=True)
+        # Clean up the key (remove spaces, check if it's 44 digits)
+        clean_key = _WHITESPACE_RE.sub("", raw_key)
+        if len(clean_key) == 44 and clean_key.isdigit():
+            return _format_access_key(clean_key)
+
+    # Also look for strong tags that might contain "Chave de acesso" followed by the key
+    strong_tags = soup.find_all("strong")
+    for tag in strong_tags:
+        if "chave de acesso" in tag.get_text(strip=True).lower():
+            # Look for the next sibling that might contain the key
+            next_sibling = tag.next_sibling
+            while next_sibling and len(next_sibling.strip()) == 0:
+                next_sibling = next_sibling.next_sibling
+            if next_sibling and isinstance(next_sibling, str):
+                # Extract potential key from the text following the "Chave de acesso" tag
+                potential_key = next_sibling.strip()
+                # Keep only digits (drop spaces and any other character)
+                clean_key = _NON_DIGIT_SPACE_RE.sub("", potential_key)
+                clean_key = _WHITESPACE_RE.sub("", clean_key)
+                if len(clean_key) == 44 and clean_key.isdigit():
+                    return _format_access_key(clean_key)
+
+            # Also check parent's siblings
+            parent = tag.parent
+            if parent:
+                # Look for spans or other elements within the parent that might contain the key
+                for child in parent.children:
+                    if child != tag and hasattr(child, "get_text"):
+                        child_text = child.get_text(strip=True)
+                        if child_text and len(child_text) >= 44:
+                            clean_key = _WHITESPACE_RE.sub("", child_text)
+                            if len(clean_key) == 44 and clean_key.isdigit():
+                                return _format_access_key(clean_key)
+
+    # If the specific element approach didn't work, fall back to the text-based approach
+    if text is None:
+        text = soup.get_text(" ", strip=True)
+
+    # Procura por padrões de chave de acesso (44 dígitos).
+    # `finditer` avalia um match por vez, permitindo abortar no primeiro
+    # válido sem materializar todos os candidatos do documento.
+    for pattern in _ACCESS_KEY_PATTERNS:
+        for match in pattern.finditer(text):
+            # Mantém apenas os dígitos (remove espaços intermediários)
+            clean_match = _WHITESPACE_RE.sub("", match.group(1))
+            if len(clean_match) == 44 and clean_match.isdigit():
+                return _format_access_key(clean_match)
+
+    # If no key found, generate a UUID-based key as fallback
+    return f"{fallback_prefix}{uuid4().hex}"
+
+
+# Mensagens de bloqueio/acesso negado da SEFAZ, em uma única alternação
+# compilada (tolerante a espaçamento variável entre as palavras). A versão em
+# bytes roda direto sobre response.content, sem decodificar a página.
+_BLOCK_TEXT_RE = re.compile(
+    r"acesso\s+(?:negado\s+ao\s+portal|bloqueado)", re.IGNORECASE
+)
+_BLOCK_BYTES_RE = re.compile(
+    rb"acesso\s+(?:negado\s+ao\s+portal|bloqueado)", re.IGNORECASE
+)
+
+# Páginas de bloqueio são pequenas e trazem a mensagem logo no início;
+# limitar a varredura inicial a este prefixo evita varrer a página inteira
+# no caso comum (página de nota legítima).
+_BLOCK_SCAN_PREFIX = 8192
+
+# Teto para o corpo de uma página de NFC-e; respostas maiores são abortadas
+# durante o download em vez de materializadas inteiras em memória.
+_MAX_RESPONSE_BYTES = 4 * 1024 * 1024
+
+
+def _looks_like_sefaz_block_bytes(content: bytes) -> bool:
+    # search(..., 0, endpos) varre só o prefixo sem copiar nem lowercasing.
+    if _BLOCK_BYTES_RE.search(content, 0, _BLOCK_SCAN_PREFIX):
+        return True
+    if len(content) <= _BLOCK_SCAN_PREFIX:
+        return False
+    # Fallback para páginas maiores; recua algumas dezenas de bytes para
+    # cobrir mensagens que cruzam a fronteira do prefixo.
+    return _BLOCK_BYTES_RE.search(content, _BLOCK_SCAN_PREFIX - 64) is not None
+
+
+@lru_cache(maxsize=512)
+def _adapter_key_for_host(host: Optional[str]) -> str:
+    """Chave do adapter para um hostname (cacheada por host)."""
+    if host and "fazenda.rj.gov.br" in host:
+        return "rj_nfe_moderno"
+    return "default"
+
 
 def _looks_like_sefaz_block_page(html: str) -> bool:
-    text = BeautifulSoup(html, "html.parser").get_text(" ", strip=True).lower()
-    return "acesso negado ao portal" in text or "acesso bloqueado" in text
+    # As mensagens de bloqueio não aparecem dentro de tags, então um search
+    # no HTML bruto equivale ao get_text() anterior sem pagar o custo de um
+    # parse completo do documento.
+    if _BLOCK_TEXT_RE.search(html, 0, _BLOCK_SCAN_PREFIX):
+        return True
+    if len(html) <= _BLOCK_SCAN_PREFIX:
+        return False
+    # Fallback para páginas maiores com a mensagem fora do prefixo.
+    return _BLOCK_TEXT_RE.search(html, _BLOCK_SCAN_PREFIX - 64) is not None
 
 
 class BaseSefazAdapter:
@@ -32,6 +275,14 @@ class BaseSefazAdapter:
 
     def parse(self, html: str) -> ParsedNote:
         """Extrai dados da nota a partir do HTML."""
+        return self.parse_soup(BeautifulSoup(html, _BS_PARSER))
+
+    def parse_soup(self, soup: BeautifulSoup) -> ParsedNote:
+        """Extrai dados da nota a partir de um documento já parseado.
+
+        Permite que o chamador compartilhe um único `BeautifulSoup` entre o
+        adapter e outras inspeções da página, sem re-parsear o HTML.
+        """
         raise NotImplementedError
 
 
@@ -49,15 +300,13 @@ class DefaultSefazAdapter(BaseSefazAdapter):
     adapters específicos por UF.
     """
 
-    def parse(self, html: str) -> ParsedNote:
-        soup = BeautifulSoup(html, "html.parser")
+    def parse_soup(self, soup: BeautifulSoup) -> ParsedNote:
+        # Texto completo calculado uma única vez e repassado aos extratores,
+        # evitando caminhadas repetidas pelo DOM em cada helper.
+        full_text = soup.get_text(" ", strip=True)
 
         # Detecção de páginas de bloqueio / acesso negado (ex.: SEFAZ-RJ).
-        normalized_text = soup.get_text(" ", strip=True).lower()
-        if (
-            "acesso negado ao portal" in normalized_text
-            or "acesso bloqueado" in normalized_text
-        ):
+        if _BLOCK_TEXT_RE.search(full_text):
             raise ValueError(
                 "Acesso à página da NFC-e foi negado pela SEFAZ. Conteúdo de nota não disponível."
             )
@@ -65,12 +314,12 @@ class DefaultSefazAdapter(BaseSefazAdapter):
         # Tentativa genérica de localizar informações básicas
         # (em um cenário real, isso seria ajustado por estado).
         seller_name = self._extract_seller_name(soup)
-        total_amount = self._extract_total_amount(soup)
-        emission_date = self._extract_date(soup)
+        total_amount = self._extract_total_amount(full_text)
+        emission_date = self._extract_date(full_text)
 
         items = self._extract_items(soup)
 
-        access_key = self._extract_access_key(soup)
+        access_key = self._extract_access_key(soup, full_text)
 
         return ParsedNote(
             date=emission_date,
@@ -81,19 +330,8 @@ class DefaultSefazAdapter(BaseSefazAdapter):
         )
 
     def _extract_seller_name(self, soup: BeautifulSoup) -> str:
-        # Procura pelo elemento txtTopo com id u20 que contém o nome do vendedor
-        seller_div = soup.find("div", {"class": "txtTopo", "id": "u20"})
-        if seller_div:
-            seller_name = seller_div.get_text(strip=True)
-            logger.info(f"[fiscal-items] seller_name lido: {seller_name}")
-
-            # Procura pelo CNPJ que está na div seguinte
-            cnpj_div = seller_div.find_next_sibling("div", class_="text")
-            if cnpj_div:
-                cnpj_text = cnpj_div.get_text(strip=True)
-                if "CNPJ:" in cnpj_text.upper():
-                    return f"{seller_name}; {cnpj_text}"
-
+        seller_name = _extract_seller_name_common(soup)
+        if seller_name is not None:
             return seller_name
 
         # Se não encontrar o formato específico, tenta métodos alternativos
@@ -104,177 +342,47 @@ class DefaultSefazAdapter(BaseSefazAdapter):
 
         return "Estabelecimento Desconhecido"
 
-    def _extract_access_key(self, soup: BeautifulSoup) -> str:
-        # First, try to find the access key using specific HTML elements
-        # Look for elements near "Chave de acesso" text
-        import re
-
-        # Look for span elements with class 'chave' which often contain the access key
-        chave_spans = soup.find_all("span", class_="chave")
-        if chave_spans:
-            raw_key = chave_spans[0].get_text(strip=True)
-            # Clean up the key (remove spaces, check if it's 44 digits)
-            clean_key = re.sub(r"\s+", "", raw_key)
-            if len(clean_key) == 44 and clean_key.isdigit():
-                # Format the key nicely with spaces every 4 digits
-                formatted_key = " ".join(
-                    [clean_key[i : i + 4] for i in range(0, len(clean_key), 4)]
-                )
-                return formatted_key
-
-        # Also look for strong tags that might contain "Chave de acesso" followed by the key
-        strong_tags = soup.find_all("strong")
-        for tag in strong_tags:
-            if "chave de acesso" in tag.get_text(strip=True).lower():
-                # Look for the next sibling that might contain the key
-                next_sibling = tag.next_sibling
-                while next_sibling and len(next_sibling.strip()) == 0:
-                    next_sibling = next_sibling.next_sibling
-                if next_sibling and isinstance(next_sibling, str):
-                    # Extract potential key from the text following the "Chave de acesso" tag
-                    potential_key = next_sibling.strip()
-                    # Clean up the key
-                    clean_key = re.sub(
-                        r"[^\d\s]", "", potential_key
-                    )  # Keep only digits and spaces
-                    clean_key = re.sub(
-                        r"\s+", "", clean_key
-                    )  # Remove all spaces temporarily
-                    if len(clean_key) == 44 and clean_key.isdigit():
-                        # Format the key nicely with spaces every 4 digits
-                        formatted_key = " ".join(
-                            [clean_key[i : i + 4] for i in range(0, len(clean_key), 4)]
-                        )
-                        return formatted_key
-
-                # Also check parent's siblings
-                parent = tag.parent
-                if parent:
-                    # Look for spans or other elements within the parent that might contain the key
-                    for child in parent.children:
-                        if child != tag and hasattr(child, "get_text"):
-                            child_text = child.get_text(strip=True)
-                            if child_text and len(child_text) >= 44:
-                                # Clean up the key
-                                clean_key = re.sub(r"\s+", "", child_text)
-                                if len(clean_key) == 44 and clean_key.isdigit():
-                                    # Format the key nicely with spaces every 4 digits
-                                    formatted_key = " ".join(
-                                        [
-                                            clean_key[i : i + 4]
-                                            for i in range(0, len(clean_key), 4)
-                                        ]
-                                    )
-                                    return formatted_key
-
-        # If the specific element approach didn't work, fall back to the original text-based approach
-        text = soup.get_text(" ", strip=True)
+    def _extract_access_key(self, soup: BeautifulSoup, text: str) -> str:
+        return _extract_access_key_common(soup, text, fallback_prefix="SCRAPING-")
 
-        # Procura por padrões de chave de acesso (44 dígitos)
-        # Procura por padrões com espaços ou sem espaços (ex: 3326 0210 6976 9700 0660 6510 7000 3680 6612 6649 4182 ou 33260210697697000660651070003680661266494182)
-        patterns = [
-            r"Chave\s*de\s*Acesso[^\d]*([0-9\s]{40,50})",  # "Chave de Acesso" followed by digits/spaces
-            r"Chave\s*de\s*acesso[^\d]*([0-9\s]{40,50})",  # "Chave de acesso" followed by digits/spaces
-            r"([0-9\s]{40,50})",  # Just the 44 digits pattern (with possible spaces)
-        ]
-
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                # Clean up the matched string to keep only digits and remove extra spaces
-                clean_match = re.sub(r"\s+", "", match.strip())
-                if len(clean_match) == 44 and clean_match.isdigit():
-                    # Format the key nicely with spaces every 4 digits
-                    formatted_key = " ".join(
-                        [clean_match[i : i + 4] for i in range(0, len(clean_match), 4)]
-                    )
-                    return formatted_key
+    def _extract_total_amount(self, text: str) -> float:
+        # Busca pela palavra "Total" com um valor em formato brasileiro logo
+        # em seguida. Uma única passada de regex em C substitui o antigo scan
+        # token a token, que pagava str.replace + exceção de float() para
+        # cada palavra da página.
+        match = _TOTAL_KEYWORD_RE.search(text)
+        if not match:
+            return 0.0
+        return float(match.group(1).translate(_BR_NUM_TRANS))
 
-        # If no key found, generate a UUID-based key as fallback
-        return f"SCRAPING-{uuid4().hex}"
+    def _extract_date(self, text: str) -> date:
+        # Procura por padrões de data e hora no HTML, como no exemplo:
+        # "Emissão: 11/02/2026 07:35:22-03:00"
 
-    def _extract_total_amount(self, soup: BeautifulSoup) -> float:
-        # Busca por textos que contenham "Total" e um valor numérico próximo.
-        text = soup.get_text(" ", strip=True)
-        # Heurística simplificada: em produção, regex mais robusta.
-        for token in text.split():
-            token_norm = token.replace(".", "").replace(",", ".")
+        # Procura pela âncora "Emissão:" seguida diretamente da data. O padrão
+        # antigo combinava grupos opcionais com vários ".*?" sob DOTALL, uma
+        # forma clássica de backtracking exponencial em páginas de terceiros;
+        # o grupo externo não contribuía em nada para a captura.
+        for emission_match in _EMISSION_DATE_RE.finditer(text):
             try:
-                value = float(token_norm)
-                if value > 0:
-                    return value
+                day, month, year = map(int, emission_match.group(1).split("/"))
+                return date(year, month, day)
             except ValueError:
                 continue
-        return 0.0
 
-    def _extract_date(self, soup: BeautifulSoup) -> date:
-        # Procura por padrões de data e hora no HTML, como no exemplo:
-        # "Emissão: 11/02/2026 07:35:22-03:00"
-        import re
-
-        # Primeiro tenta encontrar a data de emissão específica na seção "Informações gerais da Nota"
-        # Procurando por padrões específicos de emissão perto de texto relevante
-        text = soup.get_text(" ", strip=True)
-
-        # Procura pela expressão específica "Emissão:" após termos como "Número:", "Série:", etc.
-        # que indica a data de emissão da nota fiscal
-        emission_pattern = r"(?:Número:\s*\d+.*?Série:\s*\d+|Série:\s*\d+.*?Número:\s*\d+)?(?:\s*Emiss[aã]o\s*:\s*|\s*EMISS[AÃ]O\s+NORMAL[^<]*?<br[^>]*>.*?Emiss[aã]o\s*:\s*)(\d{2}/\d{2}/\d{4})"
-        emission_matches = re.findall(emission_pattern, text, re.IGNORECASE | re.DOTALL)
-        if emission_matches:
-            for match in emission_matches:
-                try:
-                    day, month, year = map(int, match.split("/"))
-                    return date(year, month, day)
-                except ValueError:
-                    continue
-
-        # Procura por padrões mais específicos na estrutura HTML conhecida
-        # Busca dentro de listas ou elementos que contenham informações da nota
-        emission_elements = soup.find_all(
-            string=re.compile(r"Emiss[aã]o:", re.IGNORECASE)
-        )
-        for element in emission_elements:
-            # Procura pela data após "Emissão:"
-            parent = element.parent if element.parent else None
-            if parent:
-                # Obtém o texto do pai e procura por padrões de data
-                parent_text = parent.get_text(" ", strip=True)
-                date_match = re.search(
-                    r"Emiss[aã]o\s*:\s*(\d{2}/\d{2}/\d{4})", parent_text, re.IGNORECASE
-                )
-                if date_match:
-                    date_str = date_match.group(1)
-                    try:
-                        day, month, year = map(int, date_str.split("/"))
-                        return date(year, month, day)
-                    except ValueError:
-                        continue
-
-        # Procura pelo padrão "Emissão: DD/MM/YYYY HH:MM:SS[timezone_offset]"
-        # ou variações como "EMISSÃO: DD/MM/YYYY HH:MM:SS" etc.
-        date_patterns = [
-            r"Emiss[aã]o\s*:\s*(\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}:\d{2}(?:[-+]\d{2}:?\d{2})?)",
-            r"Data\s+Emiss[aã]o\s*:\s*(\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}:\d{2}(?:[-+]\d{2}:?\d{2})?)",
-            r"(\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}:\d{2}(?:[-+]\d{2}:?\d{2})?)",
-        ]
-
-        for pattern in date_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                # Extrai somente a parte da data (DD/MM/YYYY) ignorando hora e timezone
-                date_part = match.split()[0]
-                try:
-                    day, month, year = map(int, date_part.split("/"))
-                    return date(year, month, day)
-                except ValueError:
-                    continue
+        # Fallback: "DD/MM/YYYY HH:MM:SS[timezone]" sem o rótulo de emissão.
+        # finditer para no primeiro candidato válido, sem materializar todos.
+        for dt_match in _DATETIME_RE.finditer(text):
+            try:
+                day, month, year = map(int, dt_match.group(1).split("/"))
+                return date(year, month, day)
+            except ValueError:
+                continue
 
         # Se não encontrar, tenta encontrar padrões de data isolados (DD/MM/YYYY)
-        simple_date_pattern = r"\b(\d{2}/\d{2}/\d{4})\b"
-        simple_matches = re.findall(simple_date_pattern, text)
-        for match in simple_matches:
+        for simple_match in _SIMPLE_DATE_RE.finditer(text):
             try:
-                day, month, year = map(int, match.split("/"))
+                day, month, year = map(int, simple_match.group(1).split("/"))
                 return date(year, month, day)
             except ValueError:
                 continue
@@ -310,10 +418,11 @@ class DefaultSefazAdapter(BaseSefazAdapter):
                             # Log if the name is "NITEROI" to help debug the issue
                             if name.lower() == "niteroi":
                                 logger.warning(
-                                    f"[fiscal-items] Item encontrado com nome 'NITEROI'. Conteúdo completo do first_td: {first_td}"
+                                    "[fiscal-items] Item encontrado com nome 'NITEROI'. Conteúdo completo do first_td: %s",
+                                    first_td,
                                 )
                                 logger.warning(
-                                    f"[fiscal-items] Texto do elemento txtTit: {name}"
+                                    "[fiscal-items] Texto do elemento txtTit: %s", name
                                 )
 
                         else:
@@ -321,48 +430,39 @@ class DefaultSefazAdapter(BaseSefazAdapter):
                             # que não seja parte dos spans com informações adicionais
                             all_text = first_td.get_text(separator="|", strip=True)
                             # Divide pelo separador e pega a primeira parte que parece ser o nome do produto
-                            parts = all_text.split("|")
-                            # Filtra partes vazias e busca a que parece ser o nome do produto
-                            for part in parts:
+                            # (ignorando códigos, quantidades, preços e o texto irrelevante "NITEROI")
+                            for part in all_text.split("|"):
                                 part = part.strip()
-                                # Ignora partes que contêm códigos, quantidades ou preços
                                 if (
-                                    part
-                                    and not any(
-                                        keyword in part.lower()
-                                        for keyword in [
-                                            "código",
-                                            "qtde",
-                                            "un:",
-                                            "vl. unit",
-                                            "r$",
-                                            "valor",
-                                        ]
-                                    )
-                                    and len(part) > 3
+                                    len(part) > 3
+                                    and not _NAME_REJECT_RE.search(part)
+                                    and part.lower() != "niteroi"
                                 ):
-                                    # Certifique-se de que não é um texto irrelevante como "NITEROI"
-                                    if part.lower() != "niteroi":
-                                        name = part
-                                        break
+                                    name = part
+                                    break
                             else:
                                 name = ""
 
                         # Se ainda assim o nome for "NITEROI", tenta obter de forma mais específica
                         if name.lower() == "niteroi" or not name:
                             # Tenta encontrar o nome do produto olhando apenas para os textos dentro do td
-                            # excluindo explicitamente spans com outras informações
-                            direct_children_texts = []
+                            # excluindo explicitamente spans com outras informações.
+                            # Uma única passada: guarda o primeiro texto direto
+                            # aceitável como fallback em vez de acumular uma
+                            # lista e varrê-la de novo depois.
+                            fallback_name = ""
                             for child in first_td.children:
                                 if hasattr(child, "name") and child.name not in [
                                     "span"
                                 ]:
                                     # Child is a NavigableString, get its text
-                                    if child is not None:
-                                        # Get the text content of the child and strip it
-                                        child_text = str(child).strip()
-                                        if child_text:
-                                            direct_children_texts.append(child_text)
+                                    child_text = str(child).strip()
+                                    if (
+                                        child_text
+                                        and not fallback_name
+                                        and child_text.lower() != "niteroi"
+                                    ):
+                                        fallback_name = child_text
                                 elif hasattr(child, "name") and child.name == "span":
                                     # Verifica se é um span com nome do produto (txtTit) ou outro tipo
                                     if (
@@ -373,12 +473,8 @@ class DefaultSefazAdapter(BaseSefazAdapter):
                                         name = child.get_text(strip=True)
                                         break
 
-                            if not name and direct_children_texts:
-                                # Usa o primeiro texto direto que não seja "NITEROI"
-                                for text in direct_children_texts:
-                                    if text.lower() != "niteroi":
-                                        name = text
-                                        break
+                            if not name and fallback_name:
+                                name = fallback_name
 
                         # Extrai quantidade e unidade dos spans
                         qty_text = "0"
@@ -388,11 +484,7 @@ class DefaultSefazAdapter(BaseSefazAdapter):
                         if qtd_span:
                             qtd_str = qtd_span.get_text(strip=True)
                             # Extrai número após "Qtde.:" ou "Qtde:"
-                            import re
-
-                            qty_match = re.search(
-                                r"Qtde\.?:?\s*([0-9,.]+)", qtd_str, re.IGNORECASE
-                            )
+                            qty_match = _QTDE_RE.search(qtd_str)
                             if qty_match:
                                 qty_text = qty_match.group(1)
 
@@ -400,7 +492,7 @@ class DefaultSefazAdapter(BaseSefazAdapter):
                         if un_span:
                             un_str = un_span.get_text(strip=True)
                             # Extrai unidade após "UN: "
-                            un_match = re.search(r"UN:\s*(\w+)", un_str, re.IGNORECASE)
+                            un_match = _UN_RE.search(un_str)
                             if un_match:
                                 unit_text = un_match.group(1)
 
@@ -410,11 +502,7 @@ class DefaultSefazAdapter(BaseSefazAdapter):
                         if price_span:
                             price_str = price_span.get_text(strip=True)
                             # Extrai número após "Vl. Unit.:" ou similar
-                            price_match = re.search(
-                                r"Vl\.?\s*Unit\.?:?\s*([0-9,.]+)",
-                                price_str,
-                                re.IGNORECASE,
-                            )
+                            price_match = _VL_UNIT_RE.search(price_str)
                             if price_match:
                                 unit_price_text = price_match.group(1)
 
@@ -430,21 +518,11 @@ class DefaultSefazAdapter(BaseSefazAdapter):
                             else unit_price_text
                         )
 
-                        def _to_float(value: str) -> float:
-                            return float(value.replace(".", "").replace(",", "."))
-
-                        try:
-                            quantity = _to_float(qty_text)
-                        except ValueError:
-                            quantity = 0.0
-                        try:
-                            unit_price = _to_float(unit_price_text)
-                        except ValueError:
-                            unit_price = 0.0
-                        try:
-                            total_price = _to_float(total_price_text)
-                        except ValueError:
-                            total_price = unit_price * quantity
+                        quantity = _to_float(qty_text)
+                        unit_price = _to_float(unit_price_text)
+                        total_price = _to_float(
+                            total_price_text, default=unit_price * quantity
+                        )
 
                         if (
                             name and name.lower() != "niteroi"
@@ -490,21 +568,11 @@ class DefaultSefazAdapter(BaseSefazAdapter):
                         else unit_price_text
                     )
 
-                    def _to_float(value: str) -> float:
-                        return float(value.replace(".", "").replace(",", "."))
-
-                    try:
-                        quantity = _to_float(qty_text)
-                    except ValueError:
-                        quantity = 0.0
-                    try:
-                        unit_price = _to_float(unit_price_text)
-                    except ValueError:
-                        unit_price = 0.0
-                    try:
-                        total_price = _to_float(total_price_text)
-                    except ValueError:
-                        total_price = unit_price * quantity
+                    quantity = _to_float(qty_text)
+                    unit_price = _to_float(unit_price_text)
+                    total_price = _to_float(
+                        total_price_text, default=unit_price * quantity
+                    )
 
                     if not name:
                         continue
@@ -538,20 +606,17 @@ class RJSefazNFCeAdapter(BaseSefazAdapter):
         Qtde:1   UN: UN   Vl. Unit.: 7,99   Vl. Total 7,99
     """
 
-    ITEM_PATTERN = re.compile(
-        r"^(?P<name>.+?)\s+Qtde:(?P<qty>[\d.,]+).*?Vl\. Unit\.:\s*(?P<unit_price>[\d.,]+).*?Vl\. Total\s*(?P<total_price>[\d.,]+)",
-        re.IGNORECASE,
-    )
-
-    def parse(self, html: str) -> ParsedNote:
-        soup = BeautifulSoup(html, "html.parser")
+    def parse_soup(self, soup: BeautifulSoup) -> ParsedNote:
+        # Texto completo calculado uma única vez e repassado aos extratores,
+        # evitando caminhadas repetidas pelo DOM em cada helper.
+        full_text = soup.get_text(" ", strip=True)
 
         seller_name = self._extract_seller_name(soup)
-        total_amount = self._extract_total_amount(soup)
-        emission_date = self._extract_date(soup)
+        total_amount = self._extract_total_amount(full_text)
+        emission_date = self._extract_date(full_text)
         items = self._extract_items(soup)
 
-        access_key = self._extract_access_key(soup)
+        access_key = self._extract_access_key(soup, full_text)
 
         return ParsedNote(
             date=emission_date,
@@ -562,208 +627,64 @@ class RJSefazNFCeAdapter(BaseSefazAdapter):
         )
 
     def _extract_seller_name(self, soup: BeautifulSoup) -> str:
-        # Procura pelo elemento txtTopo com id u20 que contém o nome do vendedor (formato padrão)
-        seller_div = soup.find("div", {"class": "txtTopo", "id": "u20"})
-        if seller_div:
-            seller_name = seller_div.get_text(strip=True)
-            logger.info(f"[fiscal-items] seller_name lido: {seller_name}")
-
-            # Procura pelo CNPJ que está na div seguinte
-            cnpj_div = seller_div.find_next_sibling("div", class_="text")
-            if cnpj_div:
-                cnpj_text = cnpj_div.get_text(strip=True)
-                if "CNPJ:" in cnpj_text.upper():
-                    return f"{seller_name}; {cnpj_text}"
-
+        seller_name = _extract_seller_name_common(soup)
+        if seller_name is not None:
             return seller_name
 
         # Se não encontrar o formato específico, tenta métodos alternativos (como no RJ)
         # No layout recente, o nome do mercado fica num bloco grande no topo.
         # Estratégia: pegar o primeiro bloco em destaque após o logo.
-        candidates = []
-        for tag_name in ("h1", "h2", "strong", "div"):
-            for el in soup.find_all(tag_name):
-                text = el.get_text(strip=True)
-                if not text:
-                    continue
-                if "cnpj:" in text.lower():
-                    # Elemento que contém nome + CNPJ; o nome geralmente é o primeiro pedaço.
-                    candidates.append(text.split("CNPJ")[0].strip(" :-"))
-        if candidates:
-            return candidates[0]
+        # Uma única caminhada pelo DOM (find_all aceita lista de tags) com
+        # retorno imediato no primeiro candidato, em vez de quatro passadas
+        # completas acumulando uma lista só para usar o primeiro elemento.
+        for el in soup.find_all(["h1", "h2", "strong", "div"]):
+            text = el.get_text(strip=True)
+            if text and "cnpj:" in text.lower():
+                # Elemento que contém nome + CNPJ; o nome geralmente é o primeiro pedaço.
+                return text.split("CNPJ")[0].strip(" :-")
         return "Estabelecimento Desconhecido"
 
-    def _extract_access_key(self, soup: BeautifulSoup) -> str:
-        # First, try to find the access key using specific HTML elements
-        # Look for elements near "Chave de acesso" text
-        import re
-
-        # Look for span elements with class 'chave' which often contain the access key
-        chave_spans = soup.find_all("span", class_="chave")
-        if chave_spans:
-            raw_key = chave_spans[0].get_text(strip=True)
-            # Clean up the key (remove spaces, check if it's 44 digits)
-            clean_key = re.sub(r"\s+", "", raw_key)
-            if len(clean_key) == 44 and clean_key.isdigit():
-                # Format the key nicely with spaces every 4 digits
-                formatted_key = " ".join(
-                    [clean_key[i : i + 4] for i in range(0, len(clean_key), 4)]
-                )
-                return formatted_key
-
-        # Also look for strong tags that might contain "Chave de acesso" followed by the key
-        strong_tags = soup.find_all("strong")
-        for tag in strong_tags:
-            if "chave de acesso" in tag.get_text(strip=True).lower():
-                # Look for the next sibling that might contain the key
-                next_sibling = tag.next_sibling
-                while next_sibling and len(next_sibling.strip()) == 0:
-                    next_sibling = next_sibling.next_sibling
-                if next_sibling and isinstance(next_sibling, str):
-                    # Extract potential key from the text following the "Chave de acesso" tag
-                    potential_key = next_sibling.strip()
-                    # Clean up the key
-                    clean_key = re.sub(
-                        r"[^\d\s]", "", potential_key
-                    )  # Keep only digits and spaces
-                    clean_key = re.sub(
-                        r"\s+", "", clean_key
-                    )  # Remove all spaces temporarily
-                    if len(clean_key) == 44 and clean_key.isdigit():
-                        # Format the key nicely with spaces every 4 digits
-                        formatted_key = " ".join(
-                            [clean_key[i : i + 4] for i in range(0, len(clean_key), 4)]
-                        )
-                        return formatted_key
-
-                # Also check parent's siblings
-                parent = tag.parent
-                if parent:
-                    # Look for spans or other elements within the parent that might contain the key
-                    for child in parent.children:
-                        if child != tag and hasattr(child, "get_text"):
-                            child_text = child.get_text(strip=True)
-                            if child_text and len(child_text) >= 44:
-                                # Clean up the key
-                                clean_key = re.sub(r"\s+", "", child_text)
-                                if len(clean_key) == 44 and clean_key.isdigit():
-                                    # Format the key nicely with spaces every 4 digits
-                                    formatted_key = " ".join(
-                                        [
-                                            clean_key[i : i + 4]
-                                            for i in range(0, len(clean_key), 4)
-                                        ]
-                                    )
-                                    return formatted_key
-
-        # If the specific element approach didn't work, fall back to the original text-based approach
-        text = soup.get_text(" ", strip=True)
-
-        # Procura por padrões de chave de acesso (44 dígitos)
-        # Procura por padrões com espaços ou sem espaços (ex: 3326 0210 6976 9700 0660 6510 7000 3680 6612 6649 4182 ou 33260210697697000660651070003680661266494182)
-        patterns = [
-            r"Chave\s*de\s*Acesso[^\d]*([0-9\s]{40,50})",  # "Chave de Acesso" followed by digits/spaces
-            r"Chave\s*de\s*acesso[^\d]*([0-9\s]{40,50})",  # "Chave de acesso" followed by digits/spaces
-            r"([0-9\s]{40,50})",  # Just the 44 digits pattern (with possible spaces)
-        ]
-
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                # Clean up the matched string to keep only digits and remove extra spaces
-                clean_match = re.sub(r"\s+", "", match.strip())
-                if len(clean_match) == 44 and clean_match.isdigit():
-                    # Format the key nicely with spaces every 4 digits
-                    formatted_key = " ".join(
-                        [clean_match[i : i + 4] for i in range(0, len(clean_match), 4)]
-                    )
-                    return formatted_key
+    def _extract_access_key(self, soup: BeautifulSoup, text: str) -> str:
+        return _extract_access_key_common(soup, text, fallback_prefix="SCRAPING-RJ-")
 
-        # If no key found, generate a UUID-based key as fallback
-        return f"SCRAPING-RJ-{uuid4().hex}"
-
-    def _extract_total_amount(self, soup: BeautifulSoup) -> float:
-        text = soup.get_text(" ", strip=True)
+    def _extract_total_amount(self, text: str) -> float:
         # Exemplo de trecho: "Valor a pagar R$: 102,80"
-        match = re.search(
-            r"Valor\s+a\s+pagar\s*R\$[: ]\s*([\d\.,]+)", text, flags=re.IGNORECASE
-        )
+        match = _TOTAL_AMOUNT_RE.search(text)
         if not match:
             return 0.0
-        value_str = match.group(1).replace(".", "").replace(",", ".")
         try:
-            return float(value_str)
+            return float(match.group(1).translate(_BR_NUM_TRANS))
         except ValueError:
             return 0.0
 
-    def _extract_date(self, soup: BeautifulSoup) -> date:
+    def _extract_date(self, text: str) -> date:
         # Procura por padrões de data e hora no HTML, como no exemplo:
         # "Emissão: 11/02/2026 07:35:22-03:00"
-        import re
-
-        # Primeiro tenta encontrar a data de emissão específica na seção "Informações gerais da Nota"
-        # Procurando por padrões específicos de emissão perto de texto relevante
-        text = soup.get_text(" ", strip=True)
-
-        # Procura pela expressão específica "Emissão:" após termos como "Número:", "Série:", etc.
-        # que indica a data de emissão da nota fiscal
-        emission_pattern = r"(?:Número:\s*\d+.*?Série:\s*\d+|Série:\s*\d+.*?Número:\s*\d+)?(?:\s*Emiss[aã]o\s*:\s*|\s*EMISS[AÃ]O\s+NORMAL[^<]*?<br[^>]*>.*?Emiss[aã]o\s*:\s*)(\d{2}/\d{2}/\d{4})"
-        emission_matches = re.findall(emission_pattern, text, re.IGNORECASE | re.DOTALL)
-        if emission_matches:
-            for match in emission_matches:
-                try:
-                    day, month, year = map(int, match.split("/"))
-                    return date(year, month, day)
-                except ValueError:
-                    continue
 
-        # Procura por padrões mais específicos na estrutura HTML conhecida
-        # Busca dentro de listas ou elementos que contenham informações da nota
-        emission_elements = soup.find_all(
-            string=re.compile(r"Emiss[aã]o:", re.IGNORECASE)
-        )
-        for element in emission_elements:
-            # Procura pela data após "Emissão:"
-            parent = element.parent if element.parent else None
-            if parent:
-                # Obtém o texto do pai e procura por padrões de data
-                parent_text = parent.get_text(" ", strip=True)
-                date_match = re.search(
-                    r"Emiss[aã]o\s*:\s*(\d{2}/\d{2}/\d{4})", parent_text, re.IGNORECASE
-                )
-                if date_match:
-                    date_str = date_match.group(1)
-                    try:
-                        day, month, year = map(int, date_str.split("/"))
-                        return date(year, month, day)
-                    except ValueError:
-                        continue
+        # Procura pela âncora "Emissão:" seguida diretamente da data. O padrão
+        # antigo combinava grupos opcionais com vários ".*?" sob DOTALL, uma
+        # forma clássica de backtracking exponencial em páginas de terceiros;
+        # o grupo externo não contribuía em nada para a captura.
+        for emission_match in _EMISSION_DATE_RE.finditer(text):
+            try:
+                day, month, year = map(int, emission_match.group(1).split("/"))
+                return date(year, month, day)
+            except ValueError:
+                continue
 
-        # Procura pelo padrão "Emissão: DD/MM/YYYY HH:MM:SS[timezone_offset]"
-        # ou variações como "EMISSÃO: DD/MM/YYYY HH:MM:SS" etc.
-        date_patterns = [
-            r"Emiss[aã]o\s*:\s*(\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}:\d{2}(?:[-+]\d{2}:?\d{2})?)",
-            r"Data\s+Emiss[aã]o\s*:\s*(\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}:\d{2}(?:[-+]\d{2}:?\d{2})?)",
-            r"(\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}:\d{2}(?:[-+]\d{2}:?\d{2})?)",
-        ]
-
-        for pattern in date_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                # Extrai somente a parte da data (DD/MM/YYYY) ignorando hora e timezone
-                date_part = match.split()[0]
-                try:
-                    day, month, year = map(int, date_part.split("/"))
-                    return date(year, month, day)
-                except ValueError:
-                    continue
+        # Fallback: "DD/MM/YYYY HH:MM:SS[timezone]" sem o rótulo de emissão.
+        # finditer para no primeiro candidato válido, sem materializar todos.
+        for dt_match in _DATETIME_RE.finditer(text):
+            try:
+                day, month, year = map(int, dt_match.group(1).split("/"))
+                return date(year, month, day)
+            except ValueError:
+                continue
 
         # Se não encontrar, tenta encontrar padrões de data isolados (DD/MM/YYYY)
-        simple_date_pattern = r"\b(\d{2}/\d{2}/\d{4})\b"
-        simple_matches = re.findall(simple_date_pattern, text)
-        for match in simple_matches:
+        for simple_match in _SIMPLE_DATE_RE.finditer(text):
             try:
-                day, month, year = map(int, match.split("/"))
+                day, month, year = map(int, simple_match.group(1).split("/"))
                 return date(year, month, day)
             except ValueError:
                 continue
@@ -799,10 +720,11 @@ class RJSefazNFCeAdapter(BaseSefazAdapter):
                             # Log if the name is "NITEROI" to help debug the issue
                             if name.lower() == "niteroi":
                                 logger.warning(
-                                    f"[fiscal-items] Item encontrado com nome 'NITEROI'. Conteúdo completo do first_td: {first_td}"
+                                    "[fiscal-items] Item encontrado com nome 'NITEROI'. Conteúdo completo do first_td: %s",
+                                    first_td,
                                 )
                                 logger.warning(
-                                    f"[fiscal-items] Texto do elemento txtTit: {name}"
+                                    "[fiscal-items] Texto do elemento txtTit: %s", name
                                 )
 
                         else:
@@ -810,48 +732,39 @@ class RJSefazNFCeAdapter(BaseSefazAdapter):
                             # que não seja parte dos spans com informações adicionais
                             all_text = first_td.get_text(separator="|", strip=True)
                             # Divide pelo separador e pega a primeira parte que parece ser o nome do produto
-                            parts = all_text.split("|")
-                            # Filtra partes vazias e busca a que parece ser o nome do produto
-                            for part in parts:
+                            # (ignorando códigos, quantidades, preços e o texto irrelevante "NITEROI")
+                            for part in all_text.split("|"):
                                 part = part.strip()
-                                # Ignora partes que contêm códigos, quantidades ou preços
                                 if (
-                                    part
-                                    and not any(
-                                        keyword in part.lower()
-                                        for keyword in [
-                                            "código",
-                                            "qtde",
-                                            "un:",
-                                            "vl. unit",
-                                            "r$",
-                                            "valor",
-                                        ]
-                                    )
-                                    and len(part) > 3
+                                    len(part) > 3
+                                    and not _NAME_REJECT_RE.search(part)
+                                    and part.lower() != "niteroi"
                                 ):
-                                    # Certifique-se de que não é um texto irrelevante como "NITEROI"
-                                    if part.lower() != "niteroi":
-                                        name = part
-                                        break
+                                    name = part
+                                    break
                             else:
                                 name = ""
 
                         # Se ainda assim o nome for "NITEROI", tenta obter de forma mais específica
                         if name.lower() == "niteroi" or not name:
                             # Tenta encontrar o nome do produto olhando apenas para os textos dentro do td
-                            # excluindo explicitamente spans com outras informações
-                            direct_children_texts = []
+                            # excluindo explicitamente spans com outras informações.
+                            # Uma única passada: guarda o primeiro texto direto
+                            # aceitável como fallback em vez de acumular uma
+                            # lista e varrê-la de novo depois.
+                            fallback_name = ""
                             for child in first_td.children:
                                 if hasattr(child, "name") and child.name not in [
                                     "span"
                                 ]:
                                     # Child is a NavigableString, get its text
-                                    if child is not None:
-                                        # Get the text content of the child and strip it
-                                        child_text = str(child).strip()
-                                        if child_text:
-                                            direct_children_texts.append(child_text)
+                                    child_text = str(child).strip()
+                                    if (
+                                        child_text
+                                        and not fallback_name
+                                        and child_text.lower() != "niteroi"
+                                    ):
+                                        fallback_name = child_text
                                 elif hasattr(child, "name") and child.name == "span":
                                     # Verifica se é um span com nome do produto (txtTit) ou outro tipo
                                     if (
@@ -862,12 +775,8 @@ class RJSefazNFCeAdapter(BaseSefazAdapter):
                                         name = child.get_text(strip=True)
                                         break
 
-                            if not name and direct_children_texts:
-                                # Usa o primeiro texto direto que não seja "NITEROI"
-                                for text in direct_children_texts:
-                                    if text.lower() != "niteroi":
-                                        name = text
-                                        break
+                            if not name and fallback_name:
+                                name = fallback_name
 
                         # Extrai quantidade e unidade dos spans
                         qty_text = "0"
@@ -877,11 +786,7 @@ class RJSefazNFCeAdapter(BaseSefazAdapter):
                         if qtd_span:
                             qtd_str = qtd_span.get_text(strip=True)
                             # Extrai número após "Qtde.:" ou "Qtde:"
-                            import re
-
-                            qty_match = re.search(
-                                r"Qtde\.?:?\s*([0-9,.]+)", qtd_str, re.IGNORECASE
-                            )
+                            qty_match = _QTDE_RE.search(qtd_str)
                             if qty_match:
                                 qty_text = qty_match.group(1)
 
@@ -889,7 +794,7 @@ class RJSefazNFCeAdapter(BaseSefazAdapter):
                         if un_span:
                             un_str = un_span.get_text(strip=True)
                             # Extrai unidade após "UN: "
-                            un_match = re.search(r"UN:\s*(\w+)", un_str, re.IGNORECASE)
+                            un_match = _UN_RE.search(un_str)
                             if un_match:
                                 unit_text = un_match.group(1)
 
@@ -899,11 +804,7 @@ class RJSefazNFCeAdapter(BaseSefazAdapter):
                         if price_span:
                             price_str = price_span.get_text(strip=True)
                             # Extrai número após "Vl. Unit.:" ou similar
-                            price_match = re.search(
-                                r"Vl\.?\s*Unit\.?:?\s*([0-9,.]+)",
-                                price_str,
-                                re.IGNORECASE,
-                            )
+                            price_match = _VL_UNIT_RE.search(price_str)
                             if price_match:
                                 unit_price_text = price_match.group(1)
 
@@ -919,21 +820,11 @@ class RJSefazNFCeAdapter(BaseSefazAdapter):
                             else unit_price_text
                         )
 
-                        def _to_float(value: str) -> float:
-                            return float(value.replace(".", "").replace(",", "."))
-
-                        try:
-                            quantity = _to_float(qty_text)
-                        except ValueError:
-                            quantity = 0.0
-                        try:
-                            unit_price = _to_float(unit_price_text)
-                        except ValueError:
-                            unit_price = 0.0
-                        try:
-                            total_price = _to_float(total_price_text)
-                        except ValueError:
-                            total_price = unit_price * quantity
+                        quantity = _to_float(qty_text)
+                        unit_price = _to_float(unit_price_text)
+                        total_price = _to_float(
+                            total_price_text, default=unit_price * quantity
+                        )
 
                         if (
                             name and name.lower() != "niteroi"
@@ -979,21 +870,11 @@ class RJSefazNFCeAdapter(BaseSefazAdapter):
                         else unit_price_text
                     )
 
-                    def _to_float(value: str) -> float:
-                        return float(value.replace(".", "").replace(",", "."))
-
-                    try:
-                        quantity = _to_float(qty_text)
-                    except ValueError:
-                        quantity = 0.0
-                    try:
-                        unit_price = _to_float(unit_price_text)
-                    except ValueError:
-                        unit_price = 0.0
-                    try:
-                        total_price = _to_float(total_price_text)
-                    except ValueError:
-                        total_price = unit_price * quantity
+                    quantity = _to_float(qty_text)
+                    unit_price = _to_float(unit_price_text)
+                    total_price = _to_float(
+                        total_price_text, default=unit_price * quantity
+                    )
 
                     if not name:
                         continue
@@ -1011,6 +892,33 @@ class RJSefazNFCeAdapter(BaseSefazAdapter):
                 if items:
                     break
 
+        if not items:
+            # Layout moderno sem tabela: itens aparecem como blocos de texto
+            # ("NOME ... Qtde:1 UN: UN Vl. Unit.: 7,99 Vl. Total 7,99").
+            # Uma única passada de finditer sobre o texto extraído substitui
+            # qualquer varredura linha a linha em Python.
+            text_nl = soup.get_text("\n", strip=True)
+
+            for block in _ITEM_BLOCK_RE.finditer(text_nl):
+                name = block.group("name").strip()
+                if not name or name.lower() == "niteroi":
+                    continue
+                quantity = _to_float(block.group("qty"))
+                unit_price = _to_float(block.group("unit_price"))
+                total_price = _to_float(
+                    block.group("total"), default=unit_price * quantity
+                )
+
+                items.append(
+                    ParsedItem(
+                        name=name,
+                        quantity=quantity,
+                        unit=block.group("unit"),
+                        unit_price=unit_price,
+                        total_price=total_price,
+                    )
+                )
+
         if not items:
             raise ValueError("Não foi possível localizar itens da nota na página HTML.")
 
@@ -1025,14 +933,43 @@ class ScraperImporter:
     ) -> None:
         # Registro de adapters por "chave" (por exemplo, UF, domínio, etc.).
         # Por enquanto, usamos apenas um adapter padrão.
-        self._adapters: Dict[str, Type[BaseSefazAdapter]] = {
-            "default": DefaultSefazAdapter,
-            "rj_nfe_moderno": RJSefazNFCeAdapter,
+        # O registro guarda instâncias (não classes): os adapters são
+        # stateless, então uma instância por chave serve todas as URLs sem
+        # alocação por chamada.
+        self._adapters: Dict[str, BaseSefazAdapter] = {
+            "default": DefaultSefazAdapter(),
+            "rj_nfe_moderno": RJSefazNFCeAdapter(),
         }
         self.backup_file_path = backup_file_path
+        # Handle de append aberto sob demanda em _save_processed_url_to_backup.
+        self._backup_fh = None
+        # Conteúdo do backup legado (array JSON), na ordem original do
+        # arquivo; None quando o backup já está em JSON Lines. A conversão
+        # acontece no primeiro append, nunca como efeito colateral da carga.
+        self._legacy_backup_urls: Optional[List[str]] = None
+        # Fetcher de browser criado sob demanda e reutilizado entre URLs
+        # bloqueadas, em vez de um por chamada.
+        self._fetcher: Optional[BrowserHTMLFetcher] = None
+        # Sessão HTTP com keep-alive: em lotes de importação, reutiliza a
+        # conexão TCP/TLS com a SEFAZ em vez de pagar um handshake por URL.
+        self._session = requests.Session()
+        http_adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504)
+            ),
+        )
+        self._session.mount("https://", http_adapter)
+        self._session.mount("http://", http_adapter)
         self._ensure_backup_directory()
         self._load_processed_urls_from_backup()
 
+    def _get_adapter(self, key: str) -> BaseSefazAdapter:
+        """Retorna a instância de adapter registrada para a chave dada."""
+
+        return self._adapters.get(key) or self._adapters["default"]
+
     def import_from_html_content(
         self,
         html_content: str,
@@ -1042,8 +979,7 @@ class ScraperImporter:
         """Faz o parsing de conteúdo HTML diretamente e retorna uma `ParsedNote`."""
         
         key = adapter_key
-        adapter_cls = self._adapters.get(key, DefaultSefazAdapter)
-        adapter = adapter_cls()
+        adapter = self._get_adapter(key)
         
         if _looks_like_sefaz_block_page(html_content):
             raise ValueError(
@@ -1059,27 +995,92 @@ class ScraperImporter:
         os.makedirs(backup_dir, exist_ok=True)
 
     def _load_processed_urls_from_backup(self) -> None:
-        """Load processed URLs from backup file."""
+        """Load processed URLs from backup file.
+
+        O arquivo usa JSON Lines (uma URL JSON por linha); o formato legado
+        de array JSON ainda é lido, e a conversão é adiada para o primeiro
+        append — carregar (ou apenas construir o importer) não reescreve um
+        arquivo rastreado.
+        """
         try:
             if os.path.exists(self.backup_file_path):
                 with open(self.backup_file_path, "r", encoding="utf-8") as f:
-                    self._processed_urls = set(json.load(f))
+                    content = f.read()
+                if content.lstrip().startswith("["):
+                    # Formato legado: guarda a lista na ordem original do
+                    # arquivo para a conversão ser determinística.
+                    legacy_urls: List[str] = json.loads(content)
+                    self._legacy_backup_urls = legacy_urls
+                    self._processed_urls = set(legacy_urls)
+                else:
+                    self._processed_urls = {
+                        json.loads(line)
+                        for line in content.splitlines()
+                        if line.strip()
+                    }
             else:
                 self._processed_urls = set()
         except Exception:
             # If there's any error reading the backup file, initialize with empty set
             self._processed_urls = set()
 
+    def _rewrite_backup_as_jsonl(self) -> None:
+        """Reescreve o backup legado como JSON Lines, na ordem original."""
+        with open(self.backup_file_path, "w", encoding="utf-8") as f:
+            for url in self._legacy_backup_urls or []:
+                f.write(json.dumps(url, ensure_ascii=False) + "\n")
+        self._legacy_backup_urls = None
+
     def _save_processed_url_to_backup(self, url: str) -> None:
-        """Save a processed URL to the backup file."""
+        """Save a processed URL to the backup file.
+
+        Anexa uma linha ao backup em vez de reescrever o arquivo inteiro a
+        cada URL — custo O(1) por importação em vez de O(n) sobre o conjunto.
+        """
+        if url in self._processed_urls:
+            return
         self._processed_urls.add(url)
         try:
-            with open(self.backup_file_path, "w", encoding="utf-8") as f:
-                json.dump(list(self._processed_urls), f, ensure_ascii=False, indent=2)
+            if self._legacy_backup_urls is not None:
+                # Migração preguiçosa do array legado: só quem de fato anexa
+                # paga a reescrita; em caso de erro, a próxima tentativa
+                # refaz a conversão.
+                self._rewrite_backup_as_jsonl()
+            if self._backup_fh is None:
+                self._backup_fh = open(self.backup_file_path, "a", encoding="utf-8")
+            self._backup_fh.write(json.dumps(url, ensure_ascii=False) + "\n")
+            self._backup_fh.flush()
         except Exception:
             # If we can't save to backup, just continue processing
             pass
 
+    def _get_fetcher(self) -> BrowserHTMLFetcher:
+        """Retorna (e memoiza) o fetcher de browser para URLs bloqueadas."""
+
+        if self._fetcher is None:
+            self._fetcher = BrowserHTMLFetcher()
+        return self._fetcher
+
+    def close(self) -> None:
+        """Fecha a sessão HTTP e o handle de append do backup, se abertos."""
+        self._session.close()
+        self._fetcher = None
+        if self._backup_fh is not None:
+            try:
+                self._backup_fh.close()
+            except Exception:
+                pass
+            self._backup_fh = None
+
+    def __enter__(self) -> "ScraperImporter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        self.close()
+
     def _convert_qrcode_url(self, url: str) -> str:
         """Converte URLs de QR code (curtas) para o formato completo.
 
@@ -1116,7 +1117,7 @@ class ScraperImporter:
             access_key = parts[0]
 
             if len(access_key) != 44:
-                logger.warning(f"[QRCode] Chave inválida: {access_key}")
+                logger.warning("[QRCode] Chave inválida: %s", access_key)
                 return url
 
             # Monta URL no formato completo com assinatura fixa
@@ -1127,22 +1128,51 @@ class ScraperImporter:
             new_params = {"p": new_param}
             new_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}?{urlencode(new_params, safe='|')}"
 
-            logger.info(f"[QRCode] URL convertida: {url} -> {new_url}")
+            logger.info("[QRCode] URL convertida: %s -> %s", url, new_url)
             return new_url
 
         except Exception as e:
-            logger.warning(f"[QRCode] Erro ao converter URL: {e}")
+            logger.warning("[QRCode] Erro ao converter URL: %s", e)
             return url
 
     def _select_adapter_key(self, url: str) -> str:
         """Retorna a chave do adapter apropriado para a URL."""
 
-        # Para URLs da SEFAZ-RJ de NFC-e utilizamos um adapter específico.
-        if "fazenda.rj.gov.br" in url:
-            return "rj_nfe_moderno"
+        # Resolução cacheada por hostname: lotes de URLs do mesmo portal não
+        # repetem a varredura de substring (query strings variam, host não).
+        return _adapter_key_for_host(urlsplit(url).hostname)
 
-        # Demais casos usam o adapter padrão.
-        return "default"
+    def _read_response_capped(self, response: requests.Response) -> str:
+        """Lê o corpo da resposta em chunks, com teto de tamanho.
+
+        Detecta bloqueio da SEFAZ nos primeiros bytes baixados (retornando
+        "" para acionar o fallback de browser sem terminar o download) e
+        aborta respostas acima de `_MAX_RESPONSE_BYTES`.
+
+        Raises:
+            ValueError: Se a resposta exceder o tamanho máximo permitido.
+        """
+
+        buffer = bytearray()
+        block_checked = False
+        for chunk in response.iter_content(65536):
+            buffer.extend(chunk)
+            if not block_checked and len(buffer) >= _BLOCK_SCAN_PREFIX:
+                block_checked = True
+                if _looks_like_sefaz_block_bytes(bytes(buffer[:_BLOCK_SCAN_PREFIX])):
+                    response.close()
+                    return ""
+            if len(buffer) > _MAX_RESPONSE_BYTES:
+                response.close()
+                raise ValueError(
+                    "Resposta da SEFAZ excede o tamanho máximo esperado para "
+                    "uma página de NFC-e."
+                )
+
+        content = bytes(buffer)
+        if _looks_like_sefaz_block_bytes(content):
+            return ""
+        return content.decode(response.encoding or "utf-8", errors="replace")
 
     def import_from_url(
         self,
@@ -1158,29 +1188,28 @@ class ScraperImporter:
         # Modo "auto": tenta requests primeiro (quando não for forçado browser).
         # Se detectar bloqueio/parse inválido, recorre ao browser real (Playwright).
         if not force_browser:
-            response = requests.get(url, timeout=10)
+            # Timeouts separados de conexão e leitura; stream=True permite
+            # abortar cedo páginas bloqueadas ou grandes demais.
+            response = self._session.get(url, stream=True, timeout=(3.05, 10))
             response.raise_for_status()
-            html_requests = response.text
+            html_requests = self._read_response_capped(response)
         else:
             html_requests = ""
 
         key = self._select_adapter_key(url)
-        adapter_cls = self._adapters.get(key, DefaultSefazAdapter)
-        adapter = adapter_cls()
+        adapter = self._get_adapter(key)
 
         if html_requests:
-            # Se já parecer bloqueio no requests, pula direto para browser.
-            if not _looks_like_sefaz_block_page(html_requests):
-                try:
-                    result = adapter.parse(html_requests)
-                    # Save URL to backup after successful processing
-                    self._save_processed_url_to_backup(url)
-                    return result
-                except ValueError:
-                    pass
+            try:
+                result = adapter.parse(html_requests)
+                # Save URL to backup after successful processing
+                self._save_processed_url_to_backup(url)
+                return result
+            except ValueError:
+                pass
 
         # Browser real
-        fetcher = BrowserHTMLFetcher()
+        fetcher = self._get_fetcher()
         html_browser = fetcher.fetch(url)
         if _looks_like_sefaz_block_page(html_browser):
             raise ValueError(
@@ -2,12 +2,161 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import date
+from functools import lru_cache
 from typing import List, Optional
-from uuid import uuid4
+import hashlib
+import os
+import re
+import sys
 import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    # Parser C do libxml2: bem mais rápido que o ElementTree puro nos XMLs
+    # de NF-e típicos. Parser único, reutilizado entre chamadas, com
+    # resolução de entidades e acesso à rede desligados.
+    from lxml import etree as _lxml_etree
+
+    # collect_ids/remove_* desligam estruturas que o parse nunca consulta
+    # (hash de IDs, comentários, PIs, nós de texto em branco), reduzindo as
+    # alocações intermediárias da passada única do libxml2.
+    _LXML_PARSER = _lxml_etree.XMLParser(
+        huge_tree=False,
+        resolve_entities=False,
+        load_dtd=False,
+        no_network=True,
+        recover=False,
+        collect_ids=False,
+        remove_comments=True,
+        remove_pis=True,
+        remove_blank_text=True,
+    )
+except ImportError:  # pragma: no cover - ambiente sem lxml
+    _lxml_etree = None
+    _LXML_PARSER = None
+
+
+# Cache de tag qualificado -> nome local interned. O conjunto de tags de
+# NF-e é pequeno e fixo, então parses sucessivos reutilizam as mesmas
+# strings em vez de realocar o sufixo a cada filho visitado.
+_LOCAL_NAME_CACHE: dict = {}
+
+
+def _local_name(tag: str) -> str:
+    """Nome local (sem o prefixo {namespace}) de um tag, cacheado."""
+
+    name = _LOCAL_NAME_CACHE.get(tag)
+    if name is None:
+        name = sys.intern(tag.rpartition("}")[2])
+        _LOCAL_NAME_CACHE[tag] = name
+    return name
+
+
+# Namespace qualificado das tags de NF-e, para o filtro em C de iter(tag).
+_NFE_NS = "{http://www.portalfiscal.inf.br/nfe}"
+
+
+# Buscas considerando namespaces, no nível do módulo para não recriar
+# objetos de função (e células de closure) a cada parse. Com lxml, um XPath
+# compilado com local-name() resolve com e sem namespace em uma única
+# travessia em C, sem o scan linear com endswith por tag.
+def _find_first_with_ns(element: ET.Element, tag_suffix: str) -> Optional[ET.Element]:
+    if _lxml_etree is not None:
+        found = _xpath_first(tag_suffix)(element)
+        return found[0] if found else None
+
+    # Caminho rápido: iter(tag qualificado) filtra em C e para no
+    # primeiro resultado, sem materializar uma lista com findall.
+    for el in element.iter(_NFE_NS + tag_suffix):
+        return el
+
+    # Depois tenta encontrar sem namespace (fallback)
+    for el in element.iter():
+        if el.tag.endswith(tag_suffix):
+            return el
+    return None
+
+
+def _findall_with_ns(element: ET.Element, tag_suffix: str) -> List[ET.Element]:
+    if _lxml_etree is not None:
+        return _xpath_all(tag_suffix)(element)
+
+    # Primeiro tenta encontrar com namespace (filtro em C)
+    elements = list(element.iter(_NFE_NS + tag_suffix))
+    if elements:
+        return elements
+
+    # Depois tenta encontrar sem namespace (fallback)
+    return [el for el in element.iter() if el.tag.endswith(tag_suffix)]
+
+# Cache LRU de notas já parseadas, chaveado pelo hash do conteúdo: XMLs
+# idênticos reaparecem com frequência (re-uploads, retries) e pulam a
+# travessia inteira. blake2b é mais rápido que sha256 em entradas curtas.
+_PARSE_CACHE: "OrderedDict[bytes, ParsedNote]" = OrderedDict()
+_PARSE_CACHE_MAX = 512
+
+
+@lru_cache(maxsize=128)
+def _parse_emission_date(date_text: str) -> date:
+    """Converte o prefixo fixo "YYYY-MM-DD" em `date`.
+
+    Posições fixas dispensam o split; o cache amortiza o construtor de
+    `date` em lotes de notas emitidas no mesmo dia.
+    """
+
+    return date(int(date_text[0:4]), int(date_text[5:7]), int(date_text[8:10]))
+
+
+# Quebras de linha (reais ou o literal "\n") no nome do emitente, tratadas
+# em uma única substituição compilada.
+_SELLER_CLEAN_RE = re.compile(r"\\n|[\r\n]+")
+
+
+# Normalização de decimais com vírgula; a maioria dos XMLs de NF-e já usa
+# ponto, então o caso comum nem paga a tradução.
+_COMMA_TO_DOT = str.maketrans({",": "."})
+
+
+def _parse_float(text: str) -> float:
+    """Converte um campo numérico de NF-e ("12,34" ou "12.34") em float."""
+
+    if "," in text:
+        return float(text.translate(_COMMA_TO_DOT))
+    return float(text)
+
+
+@lru_cache(maxsize=None)
+def _xpath_first(tag: str):
+    """XPath compilado que retorna o primeiro elemento com o nome local dado."""
+
+    return _lxml_etree.XPath(f"(.//*[local-name()='{tag}'])[1]")
+
+
+@lru_cache(maxsize=None)
+def _xpath_all(tag: str):
+    """XPath compilado que retorna todos os elementos com o nome local dado."""
+
+    return _lxml_etree.XPath(f".//*[local-name()='{tag}']")
 
 
-@dataclass
+if _lxml_etree is not None:
+    # Todos os <prod> da nota em uma única travessia C, em ordem de
+    # documento, em vez de um lookup de <prod> por <det>.
+    _XP_DET_PROD = _lxml_etree.XPath(
+        ".//*[local-name()='det']/*[local-name()='prod']"
+    )
+    # Campos do cabeçalho resolvidos com caminho direto: uma travessia por
+    # campo, em vez de localizar o pai e varrer de novo pelo filho.
+    _XP_SELLER_NAME = _lxml_etree.XPath(
+        ".//*[local-name()='emit']/*[local-name()='xNome']/text()"
+    )
+    _XP_ACCESS_KEY_ID = _lxml_etree.XPath(
+        "string((.//*[local-name()='infNFe']/@Id)[1])"
+    )
+
+
+@dataclass(slots=True)
 class ParsedItem:
     """Representa um item de produto extraído de uma nota."""
 
@@ -19,7 +168,7 @@ class ParsedItem:
     ean: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedNote:
     """Representa uma nota fiscal extraída de XML ou scraping."""
 
@@ -43,38 +192,25 @@ class XMLProcessor:
     def parse(self, xml_content: str | bytes) -> ParsedNote:
         """Processa o conteúdo XML e retorna uma `ParsedNote`."""
 
-        root = ET.fromstring(xml_content)
-
-        # Define namespace para NF-e
-        namespaces = {'nfe': 'http://www.portalfiscal.inf.br/nfe'}
-
-        # Funções auxiliares para busca considerando namespaces
-        def find_first_with_ns(element: ET.Element, tag_suffix: str) -> Optional[ET.Element]:
-            # Primeiro tenta encontrar com namespace
-            xpath = f".//nfe:{tag_suffix}"
-            elements = element.findall(xpath, namespaces)
-            if elements:
-                return elements[0]
-            
-            # Depois tenta encontrar sem namespace (fallback)
-            for el in element.iter():
-                if el.tag.endswith(tag_suffix):
-                    return el
-            return None
-
-        def findall_with_ns(element: ET.Element, tag_suffix: str) -> List[ET.Element]:
-            # Primeiro tenta encontrar com namespace
-            xpath = f".//nfe:{tag_suffix}"
-            elements = element.findall(xpath, namespaces)
-            if elements:
-                return elements
-            
-            # Depois tenta encontrar sem namespace (fallback)
-            return [el for el in element.iter() if el.tag.endswith(tag_suffix)]
+        # lxml recusa `str` com declaração de encoding; normaliza para bytes
+        # uma única vez e ambos os parsers ficam satisfeitos.
+        if isinstance(xml_content, str):
+            xml_content = xml_content.encode("utf-8")
+
+        cache_key = hashlib.blake2b(xml_content, digest_size=16).digest()
+        cached = _PARSE_CACHE.get(cache_key)
+        if cached is not None:
+            _PARSE_CACHE.move_to_end(cache_key)
+            return cached
+
+        if _lxml_etree is not None:
+            root = _lxml_etree.fromstring(xml_content, parser=_LXML_PARSER)
+        else:
+            root = ET.fromstring(xml_content)
 
         # Data de emissão: ide/dhEmi
         date_text: Optional[str] = None
-        dh_emi_el = find_first_with_ns(root, "dhEmi")
+        dh_emi_el = _find_first_with_ns(root, "dhEmi")
         if dh_emi_el is not None and dh_emi_el.text:
             # Format is YYYY-MM-DDTHH:MM:SS, extract date part
             date_text = dh_emi_el.text[:10]
@@ -82,71 +218,91 @@ class XMLProcessor:
         if not date_text:
             raise ValueError("Data de emissão não encontrada no XML.")
 
-        year, month, day = map(int, date_text.split("-"))
-        emission_date = date(year, month, day)
-
-        # Vendedor: emit/xNome
-        seller_name_el = None
-        emit_el = find_first_with_ns(root, "emit")
-        if emit_el is not None:
-            xnome_el = find_first_with_ns(emit_el, "xNome")
-            if xnome_el is not None:
-                seller_name_el = xnome_el
-
-        if seller_name_el is None or not seller_name_el.text:
+        emission_date = _parse_emission_date(date_text)
+
+        # Vendedor: emit/xNome. Com lxml, o caminho direto emit/xNome sai em
+        # uma única travessia, sem localizar <emit> e varrer de novo.
+        seller_text: Optional[str] = None
+        if _lxml_etree is not None:
+            seller_hits = _XP_SELLER_NAME(root)
+            if seller_hits:
+                seller_text = str(seller_hits[0])
+        else:
+            emit_el = _find_first_with_ns(root, "emit")
+            if emit_el is not None:
+                xnome_el = _find_first_with_ns(emit_el, "xNome")
+                if xnome_el is not None:
+                    seller_text = xnome_el.text
+
+        if not seller_text:
             raise ValueError("Nome do vendedor não encontrado no XML.")
 
-        # Clean up the seller name by removing newlines and extra whitespace
-        raw_seller_name = seller_name_el.text.strip() if seller_name_el.text else ""
-        # Handle both literal '\n' (backslash followed by n) and actual newlines
-        cleaned_seller_name = raw_seller_name.replace('\\n', ' ').replace('\n', ' ').replace('\r', ' ')
-        seller_name = ' '.join(cleaned_seller_name.split())
+        # Clean up the seller name by removing newlines and extra whitespace.
+        # Cobre tanto o literal '\n' (barra + n) quanto quebras de linha
+        # reais em uma única passada; nomes limpos pulam a substituição.
+        raw_seller_name = seller_text.strip()
+        if _SELLER_CLEAN_RE.search(raw_seller_name):
+            raw_seller_name = _SELLER_CLEAN_RE.sub(" ", raw_seller_name)
+        seller_name = ' '.join(raw_seller_name.split())
 
         # Valor Total: total/ICMSTot/vNF
-        v_nf_el = find_first_with_ns(root, "vNF")
+        v_nf_el = _find_first_with_ns(root, "vNF")
         if v_nf_el is None or not v_nf_el.text:
             raise ValueError("Valor total da nota não encontrado no XML.")
 
-        total_amount = float(v_nf_el.text.replace(",", "."))
-
-        # Chave de acesso do atributo Id na tag infNFe
-        access_key: Optional[str] = None
-        inf_nfe_el = find_first_with_ns(root, "infNFe")
-        if inf_nfe_el is not None:
-            access_key_attr = inf_nfe_el.attrib.get("Id")
-            if access_key_attr:
+        total_amount = _parse_float(v_nf_el.text)
+
+        # Chave de acesso do atributo Id na tag infNFe. Caminho rápido para o
+        # caso comum (atributo presente); o uuid4 do fallback só é importado
+        # quando realmente necessário.
+        if _lxml_etree is not None:
+            # Remover prefixo "NFe" se existir
+            access_key = str(_XP_ACCESS_KEY_ID(root)).removeprefix("NFe").strip()
+        else:
+            inf_nfe_el = _find_first_with_ns(root, "infNFe")
+            access_key = ""
+            if inf_nfe_el is not None:
                 # Remover prefixo "NFe" se existir
-                access_key = access_key_attr.replace("NFe", "").strip()
+                access_key = inf_nfe_el.get("Id", "").removeprefix("NFe").strip()
 
         if not access_key:
+            from uuid import uuid4
+
             access_key = f"XML-{uuid4().hex}"
 
-        # Itens: iterar sobre as tags det
+        # Itens: coleta todos os <prod> de uma vez. Com lxml, um único XPath
+        # compilado resolve det/prod para a nota inteira em ordem de
+        # documento, em vez de um lookup de <prod> por <det>.
+        if _lxml_etree is not None:
+            prod_els = _XP_DET_PROD(root)
+        else:
+            prod_els = []
+            for det_el in _findall_with_ns(root, "det"):
+                prod_el = _find_first_with_ns(det_el, "prod")
+                if prod_el is not None:
+                    prod_els.append(prod_el)
+
         items: List[ParsedItem] = []
-        for det_el in findall_with_ns(root, "det"):
-            prod_el: Optional[ET.Element] = find_first_with_ns(det_el, "prod")
-            if prod_el is None:
-                continue
-
-            # Extrair informações do produto
-            def _get_text_from_prod(suffix: str) -> Optional[str]:
-                for child in prod_el:
-                    # Check if tag ends with suffix, considering possible namespace
-                    tag_name = child.tag.split('}')[-1]  # Remove namespace prefix if present
-                    if tag_name == suffix and child.text:
-                        return child.text.strip()
-                return None
-
-            name = _get_text_from_prod("xProd") or ""
-            ean = _get_text_from_prod("cEAN") or None
-            q_com_text = _get_text_from_prod("qCom") or "0"
-            v_un_com_text = _get_text_from_prod("vUnCom") or "0"
-            v_prod_text = _get_text_from_prod("vProd") or v_un_com_text
-            u_com = _get_text_from_prod("uCom") or ""
-
-            quantity = float(q_com_text.replace(",", "."))
-            unit_price = float(v_un_com_text.replace(",", "."))
-            total_price = float(v_prod_text.replace(",", "."))
+        for prod_el in prod_els:
+            # Extrair informações do produto: uma única passada pelos filhos
+            # de <prod> monta um dict local-name -> texto, em vez de varrer
+            # os filhos de novo para cada campo consultado.
+            prod_texts: dict[str, str] = {}
+            for child in prod_el:
+                tag_name = _local_name(child.tag)
+                if child.text and tag_name not in prod_texts:
+                    prod_texts[tag_name] = child.text.strip()
+
+            name = prod_texts.get("xProd", "")
+            ean = prod_texts.get("cEAN") or None
+            q_com_text = prod_texts.get("qCom", "0")
+            v_un_com_text = prod_texts.get("vUnCom", "0")
+            v_prod_text = prod_texts.get("vProd") or v_un_com_text
+            u_com = prod_texts.get("uCom", "")
+
+            quantity = _parse_float(q_com_text)
+            unit_price = _parse_float(v_un_com_text)
+            total_price = _parse_float(v_prod_text)
 
             items.append(
                 ParsedItem(
@@ -159,10 +315,15 @@ class XMLProcessor:
                 )
             )
 
+            # O <prod> já foi totalmente consumido; liberar o subtree limita
+            # a memória retida durante o loop em notas com muitos itens (os
+            # demais campos da nota ficam fora de <det>).
+            prod_el.clear()
+
         if not items:
             raise ValueError("Nenhum item de produto encontrado no XML.")
 
-        return ParsedNote(
+        note = ParsedNote(
             date=emission_date,
             seller_name=seller_name,
             total_amount=total_amount,
@@ -170,6 +331,43 @@ class XMLProcessor:
             items=items,
         )
 
+        _PARSE_CACHE[cache_key] = note
+        if len(_PARSE_CACHE) > _PARSE_CACHE_MAX:
+            _PARSE_CACHE.popitem(last=False)
+        return note
+
+    def parse_many(
+        self,
+        xml_contents: List[str | bytes],
+        workers: Optional[int] = None,
+    ) -> List[ParsedNote]:
+        """Processa um lote de XMLs e retorna as notas na mesma ordem.
+
+        Lotes grandes são distribuídos entre processos (o parse é CPU-bound
+        e independente por arquivo); lotes pequenos seguem sequenciais para
+        não pagar o warm-up do pool.
+
+        Args:
+            xml_contents: Conteúdos XML a processar.
+            workers: Número de processos; por padrão, os núcleos da máquina.
+        """
+
+        max_workers = workers or os.cpu_count() or 1
+        if len(xml_contents) < 4 or max_workers <= 1:
+            return [self.parse(content) for content in xml_contents]
+
+        chunksize = max(1, len(xml_contents) // (4 * max_workers))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(
+                executor.map(_parse_one, xml_contents, chunksize=chunksize)
+            )
+
+
+def _parse_one(xml_content: str | bytes) -> ParsedNote:
+    """Função de módulo (picklável) usada pelos workers de `parse_many`."""
+
+    return XMLProcessor().parse(xml_content)
+
 
 __all__ = ["XMLProcessor", "ParsedItem", "ParsedNote"]
 
@@ -1,7 +1,79 @@
-"""Pytest configuration for backend tests."""
+"""Pytest configuration for backend tests.
+
+A suíte é segura para `pytest -n auto --dist loadfile` (pytest-xdist): cada
+worker é um processo próprio, então o pool de browsers e os bancos em memória
+nomeados por worker/uuid não se cruzam, e os mocks dos testes de fetcher
+patcham fronteiras locais ao módulo.
+"""
 
 import os
 import sys
 
+import pytest
+
 # Add backend to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+try:
+    # Parser JSON em C: acelera os response.json() das suítes de API.
+    # Opcional — sem orjson os testes seguem com o json da stdlib.
+    import orjson
+except ImportError:  # pragma: no cover - ambiente sem orjson
+    orjson = None
+
+
+@pytest.fixture(scope="session")
+def test_client():
+    """TestClient compartilhado sobre o app real, criado uma vez por sessão.
+
+    Construir o TestClient (lifespan ASGI, cliente httpx, thread pool) não é
+    barato; os módulos que usam o app real (`test_e2e_imports_legacy`,
+    `test_integration`) consomem este singleton em vez de instanciar o seu.
+
+    Deliberadamente não entra no context manager: o lifespan de produção
+    (create_all + seed no DATABASE_URL real) nunca deve rodar na suíte.
+    """
+
+    from fastapi.testclient import TestClient
+
+    from backend.app.main import app
+
+    yield TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def _restore_dependency_overrides():
+    """Reverte vazamentos de dependency_overrides do app real a cada teste.
+
+    Snapshot/restore em vez de clear(): fixtures de escopo maior (sessão)
+    registram overrides legítimos que precisam sobreviver entre testes.
+    """
+
+    from backend.app.main import app
+
+    saved = dict(app.dependency_overrides)
+    yield
+    app.dependency_overrides.clear()
+    app.dependency_overrides.update(saved)
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _fast_response_json():
+    """Troca httpx.Response.json pelo orjson durante a sessão de testes."""
+
+    if orjson is None:
+        yield
+        return
+
+    import httpx
+
+    original_json = httpx.Response.json
+
+    def json_with_orjson(self, **kwargs):
+        if kwargs:
+            return original_json(self, **kwargs)
+        return orjson.loads(self.content)
+
+    httpx.Response.json = json_with_orjson
+    yield
+    httpx.Response.json = original_json
@@ -1,7 +1,10 @@
 """Tests for browser_fetcher module."""
 
+import threading
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
 import pytest
-from unittest.mock import Mock, patch, MagicMock
 
 from backend.app.services.browser_fetcher import BrowserHTMLFetcher, BrowserFetchOptions
 
@@ -37,6 +40,33 @@ class TestBrowserFetchOptions:
         assert options.post_load_wait_ms == 2_000
 
 
+@pytest.fixture()
+def browser_mocks():
+    """Cadeia get_browser -> browser -> context -> page pré-ligada.
+
+    Cada teste ajusta só o que precisa (tipicamente page.content.return_value)
+    em vez de repetir as ~8 linhas de wiring de mocks.
+    """
+    with patch("backend.app.services.browser_pool.get_browser") as mock_get_browser:
+        browser = Mock()
+        context = Mock()
+        page = Mock()
+
+        page.content.return_value = "<html>Test</html>"
+        # Resposta de navegação "limpa" por padrão (sem bloqueio precoce)
+        page.goto.return_value.text.return_value = ""
+        context.new_page.return_value = page
+        browser.new_context.return_value = context
+        mock_get_browser.return_value = browser
+
+        yield SimpleNamespace(
+            get_browser=mock_get_browser,
+            browser=browser,
+            context=context,
+            page=page,
+        )
+
+
 class TestBrowserHTMLFetcher:
     """Tests for BrowserHTMLFetcher class."""
 
@@ -51,182 +81,183 @@ class TestBrowserHTMLFetcher:
         fetcher = BrowserHTMLFetcher(options)
         assert fetcher._options.headless is False
 
-    @patch("playwright.sync_api.sync_playwright")
-    def test_fetch_successful(self, mock_sync_playwright):
+    def test_fetch_successful(self, browser_mocks):
         """Should fetch HTML successfully."""
-        # Setup mock
-        mock_playwright = Mock()
-        mock_browser = Mock()
-        mock_context = Mock()
-        mock_page = Mock()
-
-        mock_page.content.return_value = "<html><body>Test Content</body></html>"
-        mock_context.new_page.return_value = mock_page
-        mock_browser.new_context.return_value = mock_context
-        mock_playwright.chromium.launch.return_value = mock_browser
-        mock_sync_playwright.return_value.__enter__.return_value = mock_playwright
-
-        # Execute
+        browser_mocks.page.content.return_value = (
+            "<html><body>Test Content</body></html>"
+        )
+
         fetcher = BrowserHTMLFetcher()
         result = fetcher.fetch("http://example.com")
 
-        # Assert
         assert result == "<html><body>Test Content</body></html>"
-        mock_playwright.chromium.launch.assert_called_once()
-        mock_page.goto.assert_called_once_with(
+        browser_mocks.get_browser.assert_called_once_with(True, 300)
+        browser_mocks.page.goto.assert_called_once_with(
             "http://example.com",
             wait_until="networkidle",
             timeout=20_000,
         )
-        mock_page.wait_for_timeout.assert_called_once_with(1_500)
+        # Espera por eventos, não por sleep fixo
+        browser_mocks.page.wait_for_load_state.assert_any_call("domcontentloaded")
+        browser_mocks.page.wait_for_load_state.assert_any_call(
+            "networkidle", timeout=1_500
+        )
+        browser_mocks.page.wait_for_timeout.assert_not_called()
 
-    @patch("playwright.sync_api.sync_playwright")
-    def test_fetch_with_rj_block_page_retry(self, mock_sync_playwright):
+    def test_fetch_with_rj_block_page_retry(self, browser_mocks):
         """Should retry with visible browser when RJ block page detected."""
-        # Setup mock - first call returns block page, second returns normal
-        mock_playwright = Mock()
-        mock_browser = Mock()
-        mock_context = Mock()
-        mock_page = Mock()
-
-        # First call returns block page
-        mock_page.content.return_value = (
+        browser_mocks.page.content.return_value = (
             "<html>Secretaria de Estado de Fazenda do Rio de Janeiro</html>"
         )
-        mock_context.new_page.return_value = mock_page
-        mock_browser.new_context.return_value = mock_context
-        mock_playwright.chromium.launch.return_value = mock_browser
-        mock_sync_playwright.return_value.__enter__.return_value = mock_playwright
 
-        # Execute
+        fetcher = BrowserHTMLFetcher()
+        fetcher.fetch("http://example.com")
+
+        # Snapshot único da lista de chamadas: 1ª tentativa headless,
+        # retentativa headful — sem reintrospectar o mock por atributo.
+        launches = browser_mocks.get_browser.call_args_list
+        assert [call.args[0] for call in launches] == [True, False]
+
+    def test_fetch_detects_block_early_from_navigation_response(self, browser_mocks):
+        """Should retry without waiting when the goto response shows the block."""
+        browser_mocks.page.goto.return_value.text.return_value = (
+            "<html>Secretaria de Estado de Fazenda do Rio de Janeiro</html>"
+        )
+        browser_mocks.page.content.return_value = "<html>Nota fiscal</html>"
+
         fetcher = BrowserHTMLFetcher()
         result = fetcher.fetch("http://example.com")
 
-        # Assert - should retry with headless=False
-        assert mock_playwright.chromium.launch.call_count == 2
-        # First call with headless=True
-        assert mock_playwright.chromium.launch.call_args_list[0][1]["headless"] is True
-        # Second call with headless=False
-        assert mock_playwright.chromium.launch.call_args_list[1][1]["headless"] is False
+        # Primeira tentativa aborta antes das esperas/content; só a
+        # retentativa headful serializa a página.
+        assert browser_mocks.get_browser.call_count == 2
+        browser_mocks.page.content.assert_called_once()
+        assert result == "<html>Nota fiscal</html>"
 
-    @patch("playwright.sync_api.sync_playwright")
-    def test_fetch_no_retry_when_not_headless(self, mock_sync_playwright):
+    def test_fetch_no_retry_when_not_headless(self, browser_mocks):
         """Should not retry when headless is already False."""
-        # Setup mock
-        mock_playwright = Mock()
-        mock_browser = Mock()
-        mock_context = Mock()
-        mock_page = Mock()
-
-        mock_page.content.return_value = (
+        browser_mocks.page.content.return_value = (
             "<html>Secretaria de Estado de Fazenda do Rio de Janeiro</html>"
         )
-        mock_context.new_page.return_value = mock_page
-        mock_browser.new_context.return_value = mock_context
-        mock_playwright.chromium.launch.return_value = mock_browser
-        mock_sync_playwright.return_value.__enter__.return_value = mock_playwright
 
-        # Execute with headless=False
         options = BrowserFetchOptions(headless=False)
         fetcher = BrowserHTMLFetcher(options)
-        result = fetcher.fetch("http://example.com")
+        fetcher.fetch("http://example.com")
 
         # Assert - should not retry since already not headless
-        assert mock_playwright.chromium.launch.call_count == 1
-        assert mock_playwright.chromium.launch.call_args[1]["headless"] is False
+        assert browser_mocks.get_browser.call_count == 1
+        assert browser_mocks.get_browser.call_args[0][0] is False
 
-    @patch("playwright.sync_api.sync_playwright")
-    def test_fetch_uses_custom_user_agent(self, mock_sync_playwright):
+    def test_fetch_uses_custom_user_agent(self, browser_mocks):
         """Should use custom user agent in context."""
-        mock_playwright = Mock()
-        mock_browser = Mock()
-        mock_context = Mock()
-        mock_page = Mock()
-
-        mock_page.content.return_value = "<html>Test</html>"
-        mock_context.new_page.return_value = mock_page
-        mock_browser.new_context.return_value = mock_context
-        mock_playwright.chromium.launch.return_value = mock_browser
-        mock_sync_playwright.return_value.__enter__.return_value = mock_playwright
-
         custom_ua = "Custom User Agent 1.0"
         options = BrowserFetchOptions(user_agent=custom_ua)
         fetcher = BrowserHTMLFetcher(options)
         fetcher.fetch("http://example.com")
 
         # Assert user agent was passed to new_context
-        mock_browser.new_context.assert_called_once_with(
+        browser_mocks.browser.new_context.assert_called_once_with(
             user_agent=custom_ua,
             locale="pt-BR",
         )
 
-    @patch("playwright.sync_api.sync_playwright")
-    def test_fetch_uses_correct_launch_options(self, mock_sync_playwright):
-        """Should use correct launch options."""
-        mock_playwright = Mock()
-        mock_browser = Mock()
-        mock_context = Mock()
-        mock_page = Mock()
-
-        mock_page.content.return_value = "<html>Test</html>"
-        mock_context.new_page.return_value = mock_page
-        mock_browser.new_context.return_value = mock_context
-        mock_playwright.chromium.launch.return_value = mock_browser
-        mock_sync_playwright.return_value.__enter__.return_value = mock_playwright
-
+    def test_fetch_uses_correct_launch_options(self, browser_mocks):
+        """Should request the pooled browser with correct launch options."""
         options = BrowserFetchOptions(headless=False, slow_mo_ms=500)
         fetcher = BrowserHTMLFetcher(options)
         fetcher.fetch("http://example.com")
 
-        # Assert launch was called with correct options
-        mock_playwright.chromium.launch.assert_called_with(
-            headless=False,
-            slow_mo=500,
-        )
+        # Snapshot único: o pool foi consultado uma vez, com modo e slow_mo
+        # corretos.
+        launches = browser_mocks.get_browser.call_args_list
+        assert [call.args for call in launches] == [(False, 500)]
 
-    @patch("playwright.sync_api.sync_playwright")
-    def test_fetch_closes_browser_and_context(self, mock_sync_playwright):
-        """Should close browser and context after fetching."""
-        mock_playwright = Mock()
-        mock_browser = Mock()
-        mock_context = Mock()
-        mock_page = Mock()
+    def test_fetch_closes_context_but_not_pooled_browser(self, browser_mocks):
+        """Should close the context and leave the pooled browser open."""
+        fetcher = BrowserHTMLFetcher()
+        fetcher.fetch("http://example.com")
+
+        # Assert close was called on the context only — the browser belongs
+        # to the process-wide pool and is reused by later fetches.
+        browser_mocks.context.close.assert_called_once()
+        browser_mocks.browser.close.assert_not_called()
 
-        mock_page.content.return_value = "<html>Test</html>"
-        mock_context.new_page.return_value = mock_page
-        mock_browser.new_context.return_value = mock_context
-        mock_playwright.chromium.launch.return_value = mock_browser
-        mock_sync_playwright.return_value.__enter__.return_value = mock_playwright
+    def test_fetch_runs_on_the_pool_owner_thread(self, browser_mocks):
+        """Should dispatch every fetch to the pool's single owner thread."""
+        seen_threads = []
+
+        def record_thread(*_args):
+            seen_threads.append(threading.current_thread())
+            return browser_mocks.browser
+
+        browser_mocks.get_browser.side_effect = record_thread
 
         fetcher = BrowserHTMLFetcher()
         fetcher.fetch("http://example.com")
+        fetcher.fetch("http://example.com")
 
-        # Assert close was called
-        mock_context.close.assert_called_once()
-        mock_browser.close.assert_called_once()
+        # A API síncrona do Playwright é presa à thread que a iniciou: os
+        # dois fetches devem rodar na mesma thread dona, que não é a do
+        # chamador.
+        assert len(set(seen_threads)) == 1
+        assert seen_threads[0] is not threading.current_thread()
 
-    @patch("playwright.sync_api.sync_playwright")
-    def test_fetch_uses_correct_timeout(self, mock_sync_playwright):
+    def test_fetch_uses_correct_timeout(self, browser_mocks):
         """Should use correct timeout from options."""
-        mock_playwright = Mock()
-        mock_browser = Mock()
-        mock_context = Mock()
-        mock_page = Mock()
-
-        mock_page.content.return_value = "<html>Test</html>"
-        mock_context.new_page.return_value = mock_page
-        mock_browser.new_context.return_value = mock_context
-        mock_playwright.chromium.launch.return_value = mock_browser
-        mock_sync_playwright.return_value.__enter__.return_value = mock_playwright
-
         options = BrowserFetchOptions(timeout_ms=30_000, post_load_wait_ms=2_000)
         fetcher = BrowserHTMLFetcher(options)
         fetcher.fetch("http://example.com")
 
-        # Assert timeout was used
-        mock_page.goto.assert_called_once_with(
-            "http://example.com",
-            wait_until="networkidle",
-            timeout=30_000,
+        # Snapshots das listas de chamadas: navegação com o timeout das
+        # options e post_load_wait_ms como teto da espera por rede ociosa.
+        gotos = browser_mocks.page.goto.call_args_list
+        assert [call.args for call in gotos] == [("http://example.com",)]
+        assert [call.kwargs for call in gotos] == [
+            {"wait_until": "networkidle", "timeout": 30_000}
+        ]
+        waits = browser_mocks.page.wait_for_load_state.call_args_list
+        assert ("networkidle",) in [call.args for call in waits]
+        assert {"timeout": 2_000} in [call.kwargs for call in waits]
+
+    def test_fetch_waits_for_readiness_selector(self, browser_mocks):
+        """Should wait for the readiness selector instead of networkidle."""
+        options = BrowserFetchOptions(readiness_selector="#conteudo")
+        fetcher = BrowserHTMLFetcher(options)
+        fetcher.fetch("http://example.com")
+
+        browser_mocks.page.wait_for_selector.assert_called_once_with(
+            "#conteudo", timeout=20_000
         )
-        mock_page.wait_for_timeout.assert_called_once_with(2_000)
+        browser_mocks.page.wait_for_load_state.assert_not_called()
+
+    def test_fetch_blocks_superfluous_resources(self, browser_mocks):
+        """Should register a route handler that aborts images and the like."""
+        from backend.app.services.browser_fetcher import _abort_blocked_resources
+
+        fetcher = BrowserHTMLFetcher()
+        fetcher.fetch("http://example.com")
+
+        browser_mocks.context.route.assert_called_once_with(
+            "**/*", _abort_blocked_resources
+        )
+
+        # Imagem é abortada; documento segue
+        image_route = Mock()
+        image_route.request.resource_type = "image"
+        _abort_blocked_resources(image_route)
+        image_route.abort.assert_called_once()
+        image_route.continue_.assert_not_called()
+
+        document_route = Mock()
+        document_route.request.resource_type = "document"
+        _abort_blocked_resources(document_route)
+        document_route.abort.assert_not_called()
+        document_route.continue_.assert_called_once()
+
+    def test_fetch_can_keep_all_resources(self, browser_mocks):
+        """Should skip the route handler when disable_resources is False."""
+        options = BrowserFetchOptions(disable_resources=False)
+        fetcher = BrowserHTMLFetcher(options)
+        fetcher.fetch("http://example.com")
+
+        browser_mocks.context.route.assert_not_called()
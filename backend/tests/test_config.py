@@ -1,91 +1,75 @@
-import os
 import pytest
 from backend.app.config import Config
 
 
+@pytest.fixture(autouse=True)
+def _reset_config_singleton():
+    """Zera o singleton antes e depois de cada teste de configuração."""
+    Config._instance = None
+    yield
+    Config._instance = None
+
+
 class TestConfig:
     """Tests for Config class."""
 
-    def test_default_host(self):
+    def test_default_host(self, monkeypatch):
         """Should have default host."""
-        # Reset singleton
-        Config._instance = None
-        os.environ.pop("API_HOST", None)
+        monkeypatch.delenv("API_HOST", raising=False)
         config = Config()
         assert config.host == "0.0.0.0"
 
-    def test_custom_host_from_env(self):
+    def test_custom_host_from_env(self, monkeypatch):
         """Should read host from environment variable."""
-        Config._instance = None
-        os.environ["API_HOST"] = "127.0.0.1"
+        monkeypatch.setenv("API_HOST", "127.0.0.1")
         config = Config()
         assert config.host == "127.0.0.1"
-        os.environ.pop("API_HOST", None)
-        Config._instance = None
 
-    def test_default_port(self):
+    def test_default_port(self, monkeypatch):
         """Should have default port."""
-        Config._instance = None
-        os.environ.pop("API_PORT", None)
+        monkeypatch.delenv("API_PORT", raising=False)
         config = Config()
         assert config.port == 8000
 
-    def test_custom_port_from_env(self):
+    def test_custom_port_from_env(self, monkeypatch):
         """Should read port from environment variable."""
-        Config._instance = None
-        os.environ["API_PORT"] = "9000"
+        monkeypatch.setenv("API_PORT", "9000")
         config = Config()
         assert config.port == 9000
-        os.environ.pop("API_PORT", None)
-        Config._instance = None
 
-    def test_is_production_when_env_is_production(self):
+    def test_is_production_when_env_is_production(self, monkeypatch):
         """Should return True when ENV is production."""
-        Config._instance = None
-        os.environ["ENV"] = "production"
+        monkeypatch.setenv("ENV", "production")
         config = Config()
         assert config.is_production is True
-        os.environ.pop("ENV", None)
-        Config._instance = None
 
-    def test_is_production_when_env_is_development(self):
+    def test_is_production_when_env_is_development(self, monkeypatch):
         """Should return False when ENV is development."""
-        Config._instance = None
-        os.environ["ENV"] = "development"
+        monkeypatch.setenv("ENV", "development")
         config = Config()
         assert config.is_production is False
-        os.environ.pop("ENV", None)
-        Config._instance = None
 
-    def test_is_development_default(self):
+    def test_is_development_default(self, monkeypatch):
         """Should be development by default."""
-        Config._instance = None
-        os.environ.pop("ENV", None)
+        monkeypatch.delenv("ENV", raising=False)
         config = Config()
         assert config.is_development is True
-        Config._instance = None
 
-    def test_api_base_url_default(self):
+    def test_api_base_url_default(self, monkeypatch):
         """Should have default API base URL."""
-        Config._instance = None
-        os.environ.pop("API_BASE_URL", None)
+        monkeypatch.delenv("API_BASE_URL", raising=False)
         config = Config()
         assert config.api_base_url == "http://localhost:8000"
-        Config._instance = None
 
-    def test_database_url_default(self):
+    def test_database_url_default(self, monkeypatch):
         """Should have default database URL."""
-        Config._instance = None
-        os.environ.pop("DATABASE_URL", None)
-        os.environ.pop("SQLITE_DB_PATH", None)
+        monkeypatch.delenv("DATABASE_URL", raising=False)
+        monkeypatch.delenv("SQLITE_DB_PATH", raising=False)
         config = Config()
         assert "sqlite" in config.database_url
-        Config._instance = None
 
     def test_singleton_returns_same_instance(self):
         """Should return same instance (singleton pattern)."""
-        Config._instance = None
         config1 = Config()
         config2 = Config()
         assert config1 is config2
-        Config._instance = None
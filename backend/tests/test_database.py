@@ -3,38 +3,44 @@ from __future__ import annotations
 from datetime import date
 from typing import List
 
-from sqlalchemy.orm import Session
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import selectinload
+from sqlalchemy.pool import StaticPool
 
 from backend.app.models import (
-    Base,
     Category,
     FiscalItem,
     FiscalNote,
     FiscalSourceType,
 )
-from backend.app.seed import get_engine, get_session_factory, seed_categories
+from backend.app.seed import get_session_factory_for_engine, seed_categories
 
 
-def _create_in_memory_session() -> Session:
-    """Cria uma sessão em banco SQLite em memória para testes.
+@pytest.fixture(scope="module")
+def inmemory_engine():
+    """Engine SQLite em memória compartilhada pelo módulo.
 
-    Returns:
-        Sessão SQLAlchemy conectada a um banco SQLite em memória.
+    O StaticPool mantém uma única conexão viva, então todas as sessões
+    enxergam o mesmo banco e o schema é criado uma única vez — sem os dois
+    bancos `:memory:` isolados que o par get_engine/get_session_factory
+    criava por teste.
     """
 
-    engine = get_engine("sqlite+pysqlite:///:memory:")
-    Base.metadata.create_all(engine)
-    session_factory = get_session_factory("sqlite+pysqlite:///:memory:")
-    return session_factory()
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    session_factory = get_session_factory_for_engine(engine)
+    yield engine, session_factory
+    engine.dispose()
 
 
-def test_category_hierarchy_seed_creates_expected_structure() -> None:
+def test_category_hierarchy_seed_creates_expected_structure(inmemory_engine) -> None:
     """Garante que a hierarquia de categorias foi criada corretamente."""
 
-    database_url = "sqlite+pysqlite:///:memory:"
-    engine = get_engine(database_url)
-    Base.metadata.create_all(engine)
-    session_factory = get_session_factory(database_url)
+    _engine, session_factory = inmemory_engine
 
     # Realiza o seed e verifica tudo na mesma sessão
     with session_factory() as session:
@@ -43,8 +49,12 @@ def test_category_hierarchy_seed_creates_expected_structure() -> None:
         _create_category_hierarchy(session)
         session.commit()
 
+        # selectinload traz os filhos de todas as raízes num único SELECT
+        # extra, em vez do lazy-load disparar uma query por raiz ao iterar
+        # root.children abaixo (N+1 clássico).
         roots: List[Category] = (
             session.query(Category)
+            .options(selectinload(Category.children))
             .filter(Category.parent_id.is_(None))
             .order_by(Category.name)
             .all()
@@ -85,19 +95,16 @@ def test_category_hierarchy_seed_creates_expected_structure() -> None:
         assert "Presentes e doações (dízimos, ofertas, Presentes)" in outros_children
 
 
-def test_fiscal_item_association_with_note_and_category() -> None:
+def test_fiscal_item_association_with_note_and_category(inmemory_engine) -> None:
     """Verifica se FiscalItem associa corretamente com FiscalNote e Category."""
 
-    database_url = "sqlite+pysqlite:///:memory:"
-    engine = get_engine(database_url)
-    Base.metadata.create_all(engine)
-    session_factory = get_session_factory(database_url)
+    _engine, session_factory = inmemory_engine
 
     with session_factory() as session:
+        # Grafo montado via relacionamentos e fechado num único commit: o
+        # unit-of-work ordena os INSERTs (categoria/nota antes do item) sem
+        # os flushes intermediários por objeto.
         categoria_mercado = Category(name="Mercado", parent=None)
-        session.add(categoria_mercado)
-        session.flush()
-
         nota = FiscalNote(
             date=date(2025, 1, 1),
             total_amount=100.0,
@@ -105,18 +112,15 @@ def test_fiscal_item_association_with_note_and_category() -> None:
             access_key="ABC123",
             source_type=FiscalSourceType.XML,
         )
-        session.add(nota)
-        session.flush()
-
         item = FiscalItem(
-            note_id=nota.id,
+            note=nota,
             product_name="Arroz 5kg",
             quantity=1.0,
             unit_price=20.0,
             total_price=20.0,
-            category_id=categoria_mercado.id,
+            category=categoria_mercado,
         )
-        session.add(item)
+        session.add_all([categoria_mercado, nota, item])
         session.commit()
 
         fetched_item: FiscalItem = session.query(FiscalItem).first()  # type: ignore[assignment]
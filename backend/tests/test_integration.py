@@ -1,4 +1,3 @@
-from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
@@ -14,8 +13,9 @@ from backend.app.main import app
 from backend.app.database import engine, SessionLocal
 
 
-# Setup database in memory for testing
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# Banco em memória com cache compartilhado: qualquer conexão aberta com a
+# mesma URI enxerga o mesmo banco, em vez do :memory: isolado por conexão.
+SQLALCHEMY_DATABASE_URL = "sqlite:///file:test_integration?mode=memory&cache=shared&uri=true"
 
 test_engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
@@ -25,103 +25,75 @@ test_engine = create_engine(
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
 
 
-@pytest.fixture(scope="module")
-def client():
-    # Import the app before modifying anything to ensure it's initialized
-    from backend.app.main import app
-    from fastapi.testclient import TestClient
-    
-    # Create tables in the in-memory database - this is critical for ensuring the schema exists
-    Base.metadata.create_all(bind=test_engine)
-    
-    # Manually seed categories in the test database using the same engine
+@pytest.fixture(scope="session")
+def seeded_engine():
+    """Cria o schema e o seed de categorias uma única vez por sessão."""
     from backend.app.seed import _create_category_hierarchy
+
+    Base.metadata.create_all(bind=test_engine)
     with TestingSessionLocal() as db:
         _create_category_hierarchy(db)
         db.commit()
-    
-    # Define the override function
+
+    yield test_engine
+
+    Base.metadata.drop_all(bind=test_engine)
+
+
+@pytest.fixture(scope="session")
+def client(seeded_engine, test_client):
+    """Client sobre o app real, só com o get_db sobrescrito.
+
+    Escopo de sessão: o override de get_db é instalado uma única vez para a
+    suíte inteira, sobre o TestClient singleton do conftest — nenhum boot de
+    app ou troca de override por módulo. O lifespan de produção (create_all +
+    seed) nunca dispara.
+    """
+    from backend.app.main import get_db
+
     def override_get_db():
         db = TestingSessionLocal()
         try:
             yield db
         finally:
             db.close()
-    
-    # Import get_db here to ensure it's available
-    from backend.app.main import get_db
-    # Apply the dependency override to the original app
-    original_app = app
-    original_app.dependency_overrides[get_db] = override_get_db
-    
-    # Create a new FastAPI app that copies routes but doesn't run the original lifespan
-    from fastapi import FastAPI
-    from contextlib import asynccontextmanager
-    
-    @asynccontextmanager
-    async def test_lifespan(app: FastAPI):
-        # Don't run any startup logic that might interfere with our test DB
-        yield
-    
-    test_app = FastAPI(lifespan=test_lifespan)
-    
-    # Copy routes from the original app
-    for route in original_app.routes:
-        test_app.routes.append(route)
-    
-    # Apply the same dependency override to the test app
-    test_app.dependency_overrides[get_db] = override_get_db
-    
-    with TestClient(test_app) as c:
-        yield c
-    
-    # Clean up after tests
-    Base.metadata.drop_all(bind=test_engine)
 
+    app.dependency_overrides[get_db] = override_get_db
 
-def test_complete_item_lifecycle(client):
-    """
-    Integration test validating the complete lifecycle of an item.
-    This test ensures that the system properly maps items from fiscal notes to registered products
-    using the product mapping mechanism.
+    yield test_client
+
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture(scope="module")
+def lifecycle_ctx(client):
+    """Builds the item-lifecycle context once for the module.
+
+    Runs the four setup steps (category lookup, product master, mapping,
+    fiscal note + item) a single time and exposes the responses; the tests
+    below only assert, so adding more lifecycle checks doesn't re-cross the
+    TestClient -> FastAPI -> SQLAlchemy stack per test.
     """
-    
+
     # Step 1: Create Context - Get existing categories since there's no POST /categories/
-    # We'll use the existing categories from the seed data
     categories_response = client.get("/categories")
     assert categories_response.status_code == 200, f"Failed to get categories: {categories_response.text}"
     categories_data = categories_response.json()
-    
-    # Find or create a category for our test
-    if len(categories_data) > 0:
-        # Use the first category if available
-        category_data = categories_data[0]
-    else:
-        # If no categories exist, we need to handle this differently
-        # Actually, the startup event should ensure basic categories exist
-        assert len(categories_data) > 0, "At least one category should exist"
-        category_data = categories_data[0]
-    
-    # Print for debugging
-    print(f"Using category: {category_data}")
-    
+    assert len(categories_data) > 0, "At least one category should exist"
+    category_data = categories_data[0]
+
     # Step 2: Register Master - POST /products/eans/ to register "Desodorante XPTO" with EAN 7891234567890
     product_response = client.post(
         "/products/eans/",
         json={
             "ean": "7891234567890",
             "name_standard": "Desodorante XPTO",
-            "category_id": category_data["id"],  # Use the category ID we found earlier
+            "category_id": category_data["id"],
         }
     )
     assert product_response.status_code == 200, f"Failed to create product: {product_response.text}"
-    product_data = product_response.json()
-    # Handle both string and integer representations of EAN
-    assert str(product_data["ean"]) == "7891234567890"
-    # Verify that the product was created successfully (the response indicates success)
-    assert "produto criado com sucesso" in str(product_response.text).lower()
-    
-    # Step 3: Intelligence Mapping - POST /product-mappings/ teaching the system that 
+
+    # Step 3: Intelligence Mapping - POST /product-mappings/ teaching the system that
     # at "Supermercado Real", description "DESODORANTE XPTO 150ML" corresponds to the registered EAN
     mapping_response = client.post(
         "/product-mappings/",
@@ -132,12 +104,8 @@ def test_complete_item_lifecycle(client):
         }
     )
     assert mapping_response.status_code == 200, f"Failed to create product mapping: {mapping_response.text}"
-    mapping_data = mapping_response.json()
-    # The endpoint returns a success message and ID, not the mapping data itself
-    assert "mapeamento criado com sucesso" in str(mapping_response.text).lower() or "mapeamento atualizado com sucesso" in str(mapping_response.text).lower()
-    
-    # Step 4: The Ultimate Test (Import Process)
-    # Create a FiscalNote
+
+    # Step 4: Import Process - create a FiscalNote and an item with the mapped description
     fiscal_note_response = client.post(
         "/fiscal-notes",
         json={
@@ -151,12 +119,9 @@ def test_complete_item_lifecycle(client):
     )
     assert fiscal_note_response.status_code == 200, f"Failed to create fiscal note: {fiscal_note_response.text}"
     fiscal_note_data = fiscal_note_response.json()
-    fiscal_note_id = fiscal_note_data["id"]
-    assert fiscal_note_data["seller_name"] == "Supermercado Real"
-    
-    # Add a FiscalItem with the exact description "DESODORANTE XPTO 150ML"
+
     fiscal_item_response = client.post(
-        f"/fiscal-notes/{fiscal_note_id}/items",
+        f"/fiscal-notes/{fiscal_note_data['id']}/items",
         json={
             "description": "DESODORANTE XPTO 150ML",
             "quantity": 1,
@@ -165,12 +130,43 @@ def test_complete_item_lifecycle(client):
         }
     )
     assert fiscal_item_response.status_code == 200, f"Failed to create fiscal item: {fiscal_item_response.text}"
-    fiscal_item_data = fiscal_item_response.json()
-    
-    # Critical Assertion: Verify that the backend automatically filled the product_ean column
-    # with the value 7891234567890 when saving the item
+
+    return {
+        "category": category_data,
+        "product_response": product_response,
+        "mapping_response": mapping_response,
+        "fiscal_note": fiscal_note_data,
+        "fiscal_item": fiscal_item_response.json(),
+    }
+
+
+def test_product_master_registered(lifecycle_ctx):
+    """The product master is created with the registered EAN."""
+    product_response = lifecycle_ctx["product_response"]
+    product_data = product_response.json()
+    # Handle both string and integer representations of EAN
+    assert str(product_data["ean"]) == "7891234567890"
+    assert "produto criado com sucesso" in str(product_response.text).lower()
+
+
+def test_product_mapping_registered(lifecycle_ctx):
+    """The mapping endpoint acknowledges the seller/description link."""
+    mapping_text = str(lifecycle_ctx["mapping_response"].text).lower()
+    # The endpoint returns a success message and ID, not the mapping data itself
+    assert "mapeamento criado com sucesso" in mapping_text or "mapeamento atualizado com sucesso" in mapping_text
+
+
+def test_fiscal_note_created_for_seller(lifecycle_ctx):
+    """The fiscal note is persisted for the mapped seller."""
+    assert lifecycle_ctx["fiscal_note"]["seller_name"] == "Supermercado Real"
+
+
+def test_mapping_applied_to_fiscal_item(lifecycle_ctx):
+    """
+    Critical assertion of the lifecycle: the backend automatically filled the
+    product_ean column with the registered EAN when saving the item.
+    """
+    fiscal_item_data = lifecycle_ctx["fiscal_item"]
     assert "product_ean" in fiscal_item_data, "product_ean field is missing from fiscal item response"
     assert fiscal_item_data["product_ean"] == "7891234567890", \
-        f"Expected product_ean to be '7891234567890', but got '{fiscal_item_data.get('product_ean')}'"
-    
-    print("Integration test passed: The system correctly mapped the fiscal item to the registered product EAN!")
\ No newline at end of file
+        f"Expected product_ean to be '7891234567890', but got '{fiscal_item_data.get('product_ean')}'"
\ No newline at end of file
@@ -2,7 +2,7 @@
 
 from datetime import date
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch
 from bs4 import BeautifulSoup
 
 from backend.app.services.scraper_handler import (
@@ -301,20 +301,34 @@ class TestScraperImporter:
             importer = ScraperImporter("/tmp/test_backup/processed_urls.json")
             mock_makedirs.assert_called_once_with("/tmp/test_backup", exist_ok=True)
 
-    def test_load_processed_urls_from_backup(self):
-        """Should load processed URLs from backup file."""
-        with patch("os.path.exists", return_value=True):
-            with patch("builtins.open", MagicMock()) as mock_open:
-                mock_open.return_value.__enter__.return_value.read.return_value = (
-                    '["http://example.com/1", "http://example.com/2"]'
-                )
-                with patch(
-                    "json.load",
-                    return_value=["http://example.com/1", "http://example.com/2"],
-                ):
-                    importer = ScraperImporter()
-                    assert "http://example.com/1" in importer._processed_urls
-                    assert "http://example.com/2" in importer._processed_urls
+    def test_load_processed_urls_from_backup(self, tmp_path):
+        """Should load processed URLs from a JSON Lines backup file."""
+        backup = tmp_path / "processed_urls.json"
+        backup.write_text('"http://example.com/1"\n"http://example.com/2"\n')
+
+        importer = ScraperImporter(str(backup))
+        assert "http://example.com/1" in importer._processed_urls
+        assert "http://example.com/2" in importer._processed_urls
+
+    def test_load_processed_urls_converts_legacy_json_array(self, tmp_path):
+        """Should read the legacy array and convert it lazily, in file order."""
+        backup = tmp_path / "processed_urls.json"
+        backup.write_text('["http://example.com/2", "http://example.com/1"]')
+
+        importer = ScraperImporter(str(backup))
+        assert "http://example.com/1" in importer._processed_urls
+        assert "http://example.com/2" in importer._processed_urls
+        # Construir o importer não reescreve o arquivo rastreado
+        assert backup.read_text().lstrip().startswith("[")
+
+        # O primeiro append dispara a conversão, preservando a ordem
+        # original do array (não a ordem de iteração do set).
+        importer._save_processed_url_to_backup("http://example.com/3")
+        assert backup.read_text() == (
+            '"http://example.com/2"\n'
+            '"http://example.com/1"\n'
+            '"http://example.com/3"\n'
+        )
 
     def test_load_processed_urls_empty_when_file_not_exists(self):
         """Should have empty set when backup file doesn't exist."""
@@ -329,14 +343,18 @@ class TestScraperImporter:
                 importer = ScraperImporter()
                 assert importer._processed_urls == set()
 
-    def test_save_processed_url_to_backup(self):
-        """Should save URL to backup file."""
-        with patch("builtins.open", MagicMock()) as mock_open:
-            with patch("json.dump") as mock_json_dump:
-                importer = ScraperImporter("/tmp/test.json")
-                importer._save_processed_url_to_backup("http://example.com")
-                assert "http://example.com" in importer._processed_urls
-                mock_json_dump.assert_called_once()
+    def test_save_processed_url_to_backup(self, tmp_path):
+        """Should append the URL as one JSON line to the backup file."""
+        backup = tmp_path / "processed_urls.json"
+        importer = ScraperImporter(str(backup))
+
+        importer._save_processed_url_to_backup("http://example.com")
+        assert "http://example.com" in importer._processed_urls
+        assert backup.read_text() == '"http://example.com"\n'
+
+        # URLs repetidas não geram linhas duplicadas
+        importer._save_processed_url_to_backup("http://example.com")
+        assert backup.read_text() == '"http://example.com"\n'
 
     def test_save_processed_url_continues_on_error(self):
         """Should continue when save fails."""
@@ -357,28 +375,32 @@ class TestScraperImporter:
         url = "http://example.com"
         assert importer._select_adapter_key(url) == "default"
 
-    @patch("backend.app.services.scraper_handler.requests.get")
-    def test_import_from_url_with_requests(self, mock_get):
-        """Should import from URL using requests."""
+    def test_import_from_url_with_requests(self):
+        """Should import from URL using the keep-alive session."""
+        body = f"<html><h1>Test Store</h1>{ITEMS_TABLE}</html>".encode("utf-8")
         mock_response = Mock()
-        mock_response.text = f"<html><h1>Test Store</h1>{ITEMS_TABLE}</html>"
+        mock_response.encoding = "utf-8"
+        mock_response.iter_content = Mock(return_value=[body])
         mock_response.raise_for_status = Mock()
-        mock_get.return_value = mock_response
 
         with patch.object(ScraperImporter, "_save_processed_url_to_backup"):
             importer = ScraperImporter()
-            result = importer.import_from_url("http://example.com")
+            with patch.object(
+                importer._session, "get", return_value=mock_response
+            ) as mock_get:
+                result = importer.import_from_url("http://example.com")
 
             assert result.seller_name == "Test Store"
-            mock_get.assert_called_once_with("http://example.com", timeout=10)
+            mock_get.assert_called_once_with(
+                "http://example.com", stream=True, timeout=(3.05, 10)
+            )
 
-    @patch("backend.app.services.scraper_handler.requests.get")
-    def test_import_from_url_falls_back_to_browser(self, mock_get):
+    def test_import_from_url_falls_back_to_browser(self):
         """Should fall back to browser when requests fails."""
         mock_response = Mock()
-        mock_response.text = "Acesso bloqueado"
+        mock_response.encoding = "utf-8"
+        mock_response.iter_content = Mock(return_value=[b"Acesso bloqueado"])
         mock_response.raise_for_status = Mock()
-        mock_get.return_value = mock_response
 
         with patch(
             "backend.app.services.scraper_handler.BrowserHTMLFetcher"
@@ -391,18 +413,20 @@ class TestScraperImporter:
 
             with patch.object(ScraperImporter, "_save_processed_url_to_backup"):
                 importer = ScraperImporter()
-                result = importer.import_from_url("http://example.com")
+                with patch.object(
+                    importer._session, "get", return_value=mock_response
+                ):
+                    result = importer.import_from_url("http://example.com")
 
                 assert result.seller_name == "Browser Store"
                 MockFetcher.assert_called_once()
 
-    @patch("backend.app.services.scraper_handler.requests.get")
-    def test_import_from_url_raises_on_browser_block(self, mock_get):
+    def test_import_from_url_raises_on_browser_block(self):
         """Should raise ValueError when browser is also blocked."""
         mock_response = Mock()
-        mock_response.text = "Acesso bloqueado"
+        mock_response.encoding = "utf-8"
+        mock_response.iter_content = Mock(return_value=[b"Acesso bloqueado"])
         mock_response.raise_for_status = Mock()
-        mock_get.return_value = mock_response
 
         with patch(
             "backend.app.services.scraper_handler.BrowserHTMLFetcher"
@@ -412,29 +436,30 @@ class TestScraperImporter:
             MockFetcher.return_value = mock_fetcher
 
             importer = ScraperImporter()
-            with pytest.raises(ValueError, match="SEFAZ bloqueou o acesso"):
-                importer.import_from_url("http://example.com")
+            with patch.object(importer._session, "get", return_value=mock_response):
+                with pytest.raises(ValueError, match="SEFAZ bloqueou o acesso"):
+                    importer.import_from_url("http://example.com")
 
     def test_import_from_url_skips_requests_when_force_browser(self):
         """Should skip requests when force_browser is True."""
-        with patch("backend.app.services.scraper_handler.requests.get") as mock_get:
-            with patch(
-                "backend.app.services.scraper_handler.BrowserHTMLFetcher"
-            ) as MockFetcher:
-                mock_fetcher = Mock()
-                mock_fetcher.fetch.return_value = (
-                    f"<html><h1>Browser Only</h1>{ITEMS_TABLE}</html>"
-                )
-                MockFetcher.return_value = mock_fetcher
-
-                with patch.object(ScraperImporter, "_save_processed_url_to_backup"):
-                    importer = ScraperImporter()
+        with patch(
+            "backend.app.services.scraper_handler.BrowserHTMLFetcher"
+        ) as MockFetcher:
+            mock_fetcher = Mock()
+            mock_fetcher.fetch.return_value = (
+                f"<html><h1>Browser Only</h1>{ITEMS_TABLE}</html>"
+            )
+            MockFetcher.return_value = mock_fetcher
+
+            with patch.object(ScraperImporter, "_save_processed_url_to_backup"):
+                importer = ScraperImporter()
+                with patch.object(importer._session, "get") as mock_get:
                     result = importer.import_from_url(
                         "http://example.com", force_browser=True
                     )
 
-                    assert result.seller_name == "Browser Only"
-                    mock_get.assert_not_called()
+                assert result.seller_name == "Browser Only"
+                mock_get.assert_not_called()
 
     def test_convert_qrcode_url_already_full_format(self):
         """Should return URL unchanged if already has 5+ fields."""
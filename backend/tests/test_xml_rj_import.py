@@ -2,11 +2,11 @@
 Teste E2E para importação de XML da SEFAZ RJ.
 """
 
-import os
 from pathlib import Path
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from app.main import app, get_db
 from app.models import Base
@@ -16,14 +16,13 @@ from app.seed import get_session_factory
 def test_xml_rj_import():
     """Testa a importação de XML da SEFAZ RJ usando arquivo real."""
 
-    # Remove banco de teste anterior se existir
-    test_db = "test_xml_rj.db"
-    if os.path.exists(test_db):
-        os.remove(test_db)
-
-    # Configura banco de dados em arquivo para teste
+    # Banco em memória com StaticPool, como nos demais testes: uma única
+    # conexão viva preserva o schema entre requisições e não há arquivo
+    # test_xml_rj.db para criar, sincronizar e remover.
     engine = create_engine(
-        f"sqlite:///{test_db}", connect_args={"check_same_thread": False}
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
     )
     TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -72,3 +71,4 @@ def test_xml_rj_import():
     assert len(note_details["items"]) == 32
 
     app.dependency_overrides.clear()
+    engine.dispose()